@@ -1,3 +1,10 @@
-from app.app import CalendarAgent
+# CalendarAgent is resolved lazily so that importing the package does not load
+# LangChain or the Google client libraries.
+__all__ = ['CalendarAgent', 'warm_up']
 
-__all__ = ['CalendarAgent']
\ No newline at end of file
+
+def __getattr__(name):
+    if name in __all__:
+        from app import app as _app
+        return getattr(_app, name)
+    raise AttributeError(f"module 'app' has no attribute '{name}'")
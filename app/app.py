@@ -1,31 +1,41 @@
 # app.py
+# LangChain, the LLM provider and the calendar tools are imported when an agent is
+# created rather than at module level, so importing this module stays fast.
 import os
-import sys
-from pprint import pprint
+import threading
+import uuid
 
 from datetime import datetime
-from dotenv import load_dotenv
-from langchain_google_community.calendar.utils import build_resource_service
-from langchain_cohere import ChatCohere
-from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
-from langchain_core.runnables import RunnableLambda
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List, Optional
+
+from config.logger_config import setup_logger
+
+# Set up logger
+logger = setup_logger(__name__)
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").lower() in ("1", "true", "yes")
 
-from app.auth_utils import get_credentials, logout as auth_logout, is_logged_in
-from app.calendar_tools import (
-    create_calendar_event,
-    search_calendar_events,
-    update_calendar_event,
-    delete_calendar_event,
-    get_calendars_info,
-    get_current_datetime
-)
 
 class CalendarAgent:
-    def __init__(self):
-        """Initialize the Calendar Agent with required tools and LLM."""
+    def __init__(self, compact_tools: Optional[bool] = None, measure_tokens: Optional[bool] = None):
+        """Initialize the Calendar Agent with required tools and LLM.
+        
+        Args:
+            compact_tools: Use condensed tool schemas and expose only the tools
+                          relevant to each query (default: CALENDAR_AGENT_COMPACT_TOOLS env).
+            measure_tokens: Log and emit prompt/completion tokens of every LLM call
+                           (default: CALENDAR_AGENT_MEASURE_TOKENS env).
+        """
+        from dotenv import load_dotenv
+        from langchain_core.messages import HumanMessage
+        from langchain_core.runnables import RunnableLambda
+        
         # Load environment variables
         load_dotenv()
+        self.compact_tools = _env_flag("CALENDAR_AGENT_COMPACT_TOOLS") if compact_tools is None else compact_tools
+        self.measure_tokens = _env_flag("CALENDAR_AGENT_MEASURE_TOKENS") if measure_tokens is None else measure_tokens
         
         # Initialize LLM
         if not os.environ.get("COHERE_API_KEY"):
@@ -33,20 +43,27 @@ class CalendarAgent:
         
         # Import required modules here to avoid circular imports
         from langchain.chat_models import init_chat_model
-        from langgraph.prebuilt import create_react_agent
         
         # Initialize LLM
         self.llm = init_chat_model("command-r-plus", model_provider="cohere")
         
         # Initialize tools
-        self.tools = [
-            search_calendar_events,
-            create_calendar_event,
-            update_calendar_event,
-            delete_calendar_event,
-            get_calendars_info,
-            get_current_datetime
-        ]
+        if self.compact_tools:
+            from app.compact_tools import COMPACT_TOOLS
+            self.tools = list(COMPACT_TOOLS)
+        else:
+            from app import calendar_tools
+            self.tools = [
+                calendar_tools.search_calendar_events,
+                calendar_tools.create_calendar_event,
+                calendar_tools.update_calendar_event,
+                calendar_tools.delete_calendar_event,
+                calendar_tools.get_calendars_info,
+                calendar_tools.get_current_datetime,
+                calendar_tools.bulk_calendar_operation,
+                calendar_tools.find_meeting_times,
+                calendar_tools.analyze_calendar
+            ]
        
        
             
@@ -57,66 +74,145 @@ class CalendarAgent:
                 messages = messages + [HumanMessage(content="Important formatting rules:\n- Use format '%Y-%m-%d %H:%M:%S' , if event max_datetime not provided take it 1 hour after min_datetime.\n- ")]
             return {"messages": messages}
 
-        self.agent_executor = create_react_agent(
-            model=self.llm,
-            tools=self.tools,
-            pre_model_hook=RunnableLambda(custom_instructions_hook),
-           
-        )
+        self._pre_model_hook = RunnableLambda(custom_instructions_hook)
+        self._executors = {}
+        # Server worker threads may build executors for new tool sets concurrently
+        self._executors_lock = threading.Lock()
+        self.agent_executor = self._get_executor(self.tools)
     
-    def process_message(self, query: str) -> str:
+    def warm_up(self) -> "CalendarAgent":
+        """Pay first-request costs ahead of time.
+        
+        Authenticates, builds the Google Calendar service and prefetches the
+        calendar list, which otherwise happen inside the first tool call.
+        
+        Returns:
+            CalendarAgent: The agent itself, for chaining
         """
-        Process a user query and return the AI's response.
+        from app.calendar_tools import get_api_resource
+        
+        logger.info("Warming up calendar agent")
+        get_api_resource().calendarList().list().execute()
+        return self
+    
+    def _get_executor(self, tools: List[Any]):
+        """Return the ReAct agent bound to a set of tools, building it on first use."""
+        key = tuple(t.name for t in tools)
+        with self._executors_lock:
+            if key in self._executors:
+                return self._executors[key]
+            from langgraph.prebuilt import create_react_agent
+            
+            if self.compact_tools:
+                from app.compact_tools import COMPACT_SYSTEM_PROMPT
+                executor = create_react_agent(model=self.llm, tools=tools, prompt=COMPACT_SYSTEM_PROMPT)
+            else:
+                executor = create_react_agent(model=self.llm, tools=tools, pre_model_hook=self._pre_model_hook)
+            self._executors[key] = executor
+        
+        if self.measure_tokens:
+            from app.compact_tools import estimate_tool_schema_tokens
+            logger.info(f"Tool schemas: ~{estimate_tool_schema_tokens(tools)} tokens for {len(tools)} tools")
+        return executor
+    
+    def stream_message(
+        self,
+        query: str,
+        history: Optional[List[Dict[str, str]]] = None,
+        turn_id: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Process a user query and yield events as the agent produces them.
         
         Args:
             query: The user's query string
+            history: Previous turns as {"role": "user" | "assistant", "content": str}
+            turn_id: Identifier of this turn; pass the same value when retrying a
+                    turn so events it already created are not created twice
             
-        Returns:
-            str: The AI's response
+        Yields:
+            Dict: {"type": "tool_call", "name": str} when the agent calls a tool,
+                  {"type": "message", "content": str} for each AI response,
+                  {"type": "usage", ...} per LLM call when measure_tokens is set
         """
+        from langchain_core.messages import HumanMessage, AIMessage
+        from app.calendar_tools import current_turn_id
+        
         # Get current datetime for context
         now_str = datetime.now().strftime("%A, %B %d, %Y %H:%M:%S")
+        messages = [
+            HumanMessage(content=m["content"]) if m["role"] == "user" else AIMessage(content=m["content"])
+            for m in history or []
+        ]
+        messages += [
+            HumanMessage(content=f"current datetime is {now_str}"),
+            HumanMessage(content=query)
+        ]
+        
+        executor = self.agent_executor
+        if self.compact_tools:
+            from app.tool_selection import select_tools
+            tools = select_tools(query, self.tools, history)
+            logger.info(f"Exposing {len(tools)} of {len(self.tools)} tools: {', '.join(t.name for t in tools)}")
+            executor = self._get_executor(tools)
+        
+        # Tools read the turn id to make event creation idempotent
+        token = current_turn_id.set(turn_id or uuid.uuid4().hex)
         try:
-            # Initialize messages list
-            all_messages = []
+            seen = len(messages)
+            for chunk in executor.stream({"messages": messages}, stream_mode="values"):
+                if not (isinstance(chunk, dict) and "messages" in chunk):
+                    continue
+                new_messages = chunk["messages"][seen:]
+                seen = len(chunk["messages"])
+                for msg in new_messages:
+                    if not isinstance(msg, AIMessage):
+                        continue
+                    if self.measure_tokens and msg.usage_metadata:
+                        usage = msg.usage_metadata
+                        logger.info(f"LLM call: {usage.get('input_tokens')} prompt tokens, {usage.get('output_tokens')} completion tokens")
+                        yield {"type": "usage", "input_tokens": usage.get("input_tokens"), "output_tokens": usage.get("output_tokens")}
+                    for call in msg.tool_calls:
+                        yield {"type": "tool_call", "name": call["name"]}
+                    if not msg.additional_kwargs.get("finish_reason") == "TOOL_CALL":
+                        yield {"type": "message", "content": msg.content}
+        finally:
+            current_turn_id.reset(token)
+    
+    def process_message(
+        self,
+        query: str,
+        history: Optional[List[Dict[str, str]]] = None,
+        turn_id: Optional[str] = None
+    ) -> str:
+        """
+        Process a user query and return the AI's response.
+        
+        Args:
+            query: The user's query string
+            history: Previous turns as {"role": "user" | "assistant", "content": str}
+            turn_id: Identifier of this turn, reused when retrying it
             
-            # Stream the response
-            for chunk in self.agent_executor.stream(
-                {"messages": [
-                    HumanMessage(content=f"current datetime is {now_str}"),
-                    HumanMessage(content=query)
-                ]},
-                stream_mode="values"
-            ):
-                if isinstance(chunk, dict) and "messages" in chunk:
-                    all_messages = chunk["messages"]
+        Returns:
+            str: The AI's response
             
-            # Extract AI messages from the final state
+        Raises:
+            Exception: Errors of the turn are logged and re-raised, so the caller
+                      can retry it with the same turn_id
+        """
+        try:
             ai_messages = [
-                msg.content for msg in all_messages 
-                if isinstance(msg, AIMessage) and 
-                not msg.additional_kwargs.get("finish_reason") == "TOOL_CALL"
+                event["content"] for event in self.stream_message(query, history, turn_id)
+                if event["type"] == "message"
             ]
-            
-            
-        # Return the last complete response
-            return ai_messages[-1] if ai_messages else "I couldn't generate a response. Please try again."
-    
         except Exception as e:
-            print(f"Error processing message: {str(e)}")
-            return "An error occurred while processing your request."
-        # Process the query
-        # response = self.agent_executor.stream(
-        #     {"messages": [
-        #         ("user", "current datetime is " + now_str),
-        #         ("user", query)
-        #     ]},
-        #     stream_mode="values",
-        # )
-        # # Extract and return the AI's response
-        # streamed_outputs = response["messages"]
-        # ai_messages = [msg for msg in streamed_outputs if isinstance(msg, AIMessage)]
-    
-        # if ai_messages:
-        #     return ai_messages[-1].content
-        # return "I couldn't generate a response. Please try again."
+            logger.error(f"Error processing message: {str(e)}")
+            raise
+        
+        # Return the last complete response
+        return ai_messages[-1] if ai_messages else "I couldn't generate a response. Please try again."
+
+
+def warm_up() -> CalendarAgent:
+    """Create a CalendarAgent and warm it up, so the first request is not slowed down."""
+    return CalendarAgent().warm_up()
@@ -2,8 +2,6 @@
 import os
 from typing import Optional
 from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
 from config.logger_config import setup_logger
 
 # Set up logger
@@ -15,14 +13,6 @@ TOKEN_FILE = "token.json"
 CREDENTIALS_FILE = "../credentials.json"
 REDIRECT_URI = "http://localhost:8080/callback"
 
-import datetime
-import os.path
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-
 # If modifying these scopes, delete the file token.json.
 SCOPES = ["https://www.googleapis.com/auth/calendar"]  # Full access to manage calendar
 
@@ -33,6 +23,10 @@ def get_credentials() -> Credentials:
         Credentials: Valid Google Calendar credentials
     """
     logger.info("Getting Calendar credentials")
+    # Only needed to refresh or obtain a token, so not imported at module level
+    from google.auth.transport.requests import Request
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
     creds = None
     if os.path.exists("token.json"):
         logger.debug("Loading existing credentials from token.json")
@@ -1,16 +1,27 @@
+# langchain_google_community and googleapiclient are imported inside the functions
+# that use them, and the Google service is built on first use (see get_api_resource),
+# so importing this module stays cheap and does not start the OAuth flow.
 from langchain_core.tools import tool
-from langchain_google_community.calendar.create_event import CalendarCreateEvent
-from langchain_google_community.calendar.search_events import CalendarSearchEvents
-from langchain_google_community.calendar.update_event import CalendarUpdateEvent
-from langchain_google_community.calendar.delete_event import CalendarDeleteEvent
-from langchain_google_community.calendar.get_calendars_info import GetCalendarsInfo
-from langchain_google_community.calendar.current_datetime import GetCurrentDatetime
-from datetime import datetime
-from typing import Optional, Dict, List, Any
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Optional, Dict, List, Any, Iterator
+from zoneinfo import ZoneInfo
 from config.logger_config import setup_logger
 from app.auth_utils import get_credentials, logout as auth_logout, is_logged_in
-from langchain_google_community.calendar.utils import (
-    build_resource_service,
+from app.scheduling import (
+    find_candidate_slots,
+    intersect_intervals,
+    merge_busy_intervals,
+    parse_rfc3339,
+    working_windows,
 )
 
 
@@ -18,10 +29,176 @@ from langchain_google_community.calendar.utils import (
 logger = setup_logger(__name__)
 
 
-# Initialize credentials at module level
-credentials = get_credentials()
+_api_resource = None
+_api_resource_lock = threading.Lock()
 
-api_resource = build_resource_service(credentials=credentials)
+
+def get_api_resource():
+    """Return the Google Calendar service, authenticating and building it on first use."""
+    global _api_resource
+    with _api_resource_lock:
+        if _api_resource is None:
+            from langchain_google_community.calendar.utils import build_resource_service
+
+            logger.info("Building Google Calendar service")
+            credentials = get_credentials()
+            _api_resource = build_resource_service(credentials=credentials)
+    return _api_resource
+
+
+# Bulk operations: the Google batch endpoint accepts at most 50 calls per batch,
+# and we pause between batches to stay under the per-user rate limit.
+BULK_BATCH_SIZE = 50
+BULK_BATCH_INTERVAL = 1.0
+# Items rejected by the rate limiter are retried with exponential backoff
+BULK_MAX_RETRIES = 5
+BULK_BACKOFF_BASE = 1.0
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+BULK_PREVIEW_LIMIT = 25
+BULK_UPDATE_FIELDS = {
+    "summary": "summary",
+    "description": "description",
+    "location": "location",
+    "color_id": "colorId",
+    "transparency": "transparency",
+}
+BULK_UPDATE_KEYS = set(BULK_UPDATE_FIELDS) | {"append_description"}
+
+# Free/busy: freebusy.query accepts at most 50 calendars per request. Results are
+# cached per calendar for a short time so follow-up turns ("what about Thursday
+# instead?") within the same week are answered without another API call.
+FREEBUSY_MAX_CALENDARS = 50
+FREEBUSY_CACHE_TTL = 120
+FREEBUSY_PREFETCH_DAYS = 7
+FREEBUSY_CACHE_SIZE = 512
+_freebusy_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_freebusy_cache_lock = threading.Lock()
+# Bumped by every write, so a query that started before it does not cache stale data
+_freebusy_cache_generation = 0
+
+
+def _invalidate_freebusy_cache() -> None:
+    """Drop all cached free/busy data after a write.
+
+    A created or changed event can also affect the cached calendars of its
+    attendees, so the whole cache is cleared rather than one calendar.
+    """
+    global _freebusy_cache_generation
+    with _freebusy_cache_lock:
+        _freebusy_cache.clear()
+        _freebusy_cache_generation += 1
+
+# Analytics: only the fields the event table keeps are requested from events.list
+ANALYZE_PAGE_FIELDS = "nextPageToken,items(status,summary,start,end,transparency,attendees(email,self,responseStatus))"
+ANALYZE_GROUPS = ["week", "weekday", "hour_of_day", "attendee", "calendar"]
+WEEKDAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Idempotent creation: the agent sets the current turn id, and create_calendar_event
+# derives a deterministic event id from it and the normalized arguments. Recent
+# results are kept in a bounded LRU so a retried call returns without a network call.
+IDEMPOTENCY_CACHE_SIZE = 256
+current_turn_id: ContextVar[Optional[str]] = ContextVar("current_turn_id", default=None)
+_created_events: "OrderedDict[str, str]" = OrderedDict()
+_created_events_lock = threading.Lock()
+
+
+def _idempotency_key(turn_id: str, arguments: Dict[str, Any]) -> str:
+    """Derive a Google event id from the turn id and the normalized create arguments.
+
+    Event ids may only use base32hex characters (0-9, a-v), which hex digests satisfy.
+    """
+    normalized = {
+        key: value.strip() if isinstance(value, str) else value
+        for key, value in arguments.items()
+        if value is not None
+    }
+    if normalized.get("attendees"):
+        normalized["attendees"] = sorted(email.strip().lower() for email in normalized["attendees"])
+    payload = json.dumps({"turn_id": turn_id, "arguments": normalized}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _remember_created_event(event_id: str, result: str) -> None:
+    with _created_events_lock:
+        _created_events[event_id] = result
+        _created_events.move_to_end(event_id)
+        while len(_created_events) > IDEMPOTENCY_CACHE_SIZE:
+            _created_events.popitem(last=False)
+
+
+EMAIL_PATTERN = re.compile(r"^[^@]+@[^@]+\.[^@]+$")
+REMINDER_METHODS = {"email", "popup"}
+
+
+def _event_time(value: str, tz_name: str) -> Dict[str, str]:
+    """Convert 'YYYY-MM-DD' (all-day) or 'YYYY-MM-DD HH:MM:SS' in tz_name to an event time."""
+    try:
+        if len(value) == 10:
+            datetime.strptime(value, "%Y-%m-%d")
+            return {"date": value}
+        local = datetime.strptime(value, "%Y-%m-%d %H:%M:%S").replace(tzinfo=ZoneInfo(tz_name))
+    except ValueError:
+        raise ValueError(f"The datetime format is incorrect: '{value}'")
+    return {"dateTime": local.isoformat(), "timeZone": tz_name}
+
+
+def _build_event_body(
+    summary: str,
+    start_datetime: str,
+    end_datetime: str,
+    timezone: str = "UTC",
+    description: Optional[str] = None,
+    location: Optional[str] = None,
+    attendees: Optional[List[str]] = None,
+    color_id: Optional[str] = None,
+    conference_data: Optional[bool] = None,
+    recurrence: Optional[Dict[str, Any]] = None,
+    reminders: Any = None,
+    transparency: Optional[str] = None
+) -> Dict[str, Any]:
+    """Build the events.insert body for create_calendar_event arguments.
+
+    Built here rather than through the community toolkit so the deterministic
+    event id and conference request id can be set on a body we own.
+    """
+    body: Dict[str, Any] = {
+        "summary": summary,
+        "start": _event_time(start_datetime, timezone),
+        "end": _event_time(end_datetime, timezone),
+    }
+    if location:
+        body["location"] = location
+    if description:
+        body["description"] = description
+    if color_id:
+        body["colorId"] = color_id
+    if transparency:
+        body["transparency"] = transparency
+    if recurrence:
+        rule = ";".join(f"{key}={value}" for key, value in recurrence.items() if value is not None)
+        body["recurrence"] = [f"RRULE:{rule}"]
+    if attendees:
+        invalid = [email for email in attendees if not EMAIL_PATTERN.match(email)]
+        if invalid:
+            raise ValueError(f"Invalid attendee email(s): {', '.join(invalid)}")
+        body["attendees"] = [{"email": email} for email in attendees]
+    if reminders is True:
+        body["reminders"] = {"useDefault": True}
+    elif isinstance(reminders, list):
+        for reminder in reminders:
+            if reminder.get("method") not in REMINDER_METHODS or "minutes" not in reminder:
+                raise ValueError(f"Invalid reminder: {reminder}. Use {{'method': 'email' or 'popup', 'minutes': <minutes>}}")
+        body["reminders"] = {"useDefault": False, "overrides": reminders}
+    elif reminders is not None:
+        body["reminders"] = {"useDefault": False}
+    if conference_data:
+        body["conferenceData"] = {
+            "createRequest": {
+                "requestId": uuid.uuid4().hex,
+                "conferenceSolutionKey": {"type": "hangoutsMeet"},
+            }
+        }
+    return body
 
 @tool
 def create_calendar_event(
@@ -68,24 +245,66 @@ def create_calendar_event(
         Dict: Created event details.
     """
     logger.info(f"Creating calendar event: {summary}")
+    arguments = {
+        "summary": summary,
+        "start_datetime": start_datetime,
+        "end_datetime": end_datetime,
+        "timezone": timezone,
+        "description": description,
+        "location": location,
+        "attendees": attendees,
+        "color_id": color_id,
+        "conference_data": conference_data,
+        "recurrence": recurrence,
+        "reminders": reminders,
+        "transparency": transparency
+    }
+    turn_id = current_turn_id.get()
+    event_id = _idempotency_key(turn_id, dict(arguments, calendar_id=calendar_id)) if turn_id else None
+    if event_id:
+        with _created_events_lock:
+            cached = _created_events.get(event_id)
+            if cached is not None:
+                _created_events.move_to_end(event_id)
+        if cached is not None:
+            logger.info(f"Returning cached result for repeated create of event {event_id}")
+            return cached
     try:
-        toolkit = CalendarCreateEvent(api_resource=api_resource)
-        result = toolkit.invoke({
-            "calendar_id": calendar_id,
-            "summary": summary,
-            "start_datetime": start_datetime,
-            "end_datetime": end_datetime,
-            "timezone": timezone,
-            "description": description,
-            "location": location,
-            "attendees": attendees,
-            "color_id": color_id,
-            "conference_data": conference_data,
-            "recurrence": recurrence,
-            "reminders": reminders,
-            "transparency": transparency
-        })
-        logger.info(f"Successfully created event with ID: {result}")
+        from googleapiclient.errors import HttpError
+
+        body = _build_event_body(**arguments)
+        if event_id:
+            body["id"] = event_id
+            if "conferenceData" in body:
+                body["conferenceData"]["createRequest"]["requestId"] = event_id
+
+        conference_version = 1 if conference_data else 0
+        try:
+            event = get_api_resource().events().insert(
+                calendarId=calendar_id,
+                body=body,
+                conferenceDataVersion=conference_version
+            ).execute()
+        except HttpError as e:
+            if not event_id or e.resp.status != 409:
+                raise
+            # The event already exists: an earlier attempt of this call went through
+            logger.info(f"Event {event_id} already exists, resolving conflict without a duplicate")
+            event = get_api_resource().events().get(calendarId=calendar_id, eventId=event_id).execute()
+            if event.get("status") == "cancelled":
+                # Deleted since it was created; the user asked for it again
+                del body["id"]
+                event = get_api_resource().events().insert(
+                    calendarId=calendar_id,
+                    body=body,
+                    conferenceDataVersion=conference_version
+                ).execute()
+
+        _invalidate_freebusy_cache()
+        result = f"Event created: {event.get('htmlLink')}"
+        if event_id:
+            _remember_created_event(event_id, result)
+        logger.info(f"Successfully created event with ID: {event.get('id')}")
         return result
     except Exception as e:
         logger.error(f"Error creating calendar event: {str(e)}")
@@ -117,11 +336,14 @@ def search_calendar_events(
     """
     logger.info(f"Searching calendar events from {min_datetime} to {max_datetime}")
     try:
+        from langchain_google_community.calendar.get_calendars_info import GetCalendarsInfo
+        from langchain_google_community.calendar.search_events import CalendarSearchEvents
+
         # Get calendars info first
-        calendars_info_tool = GetCalendarsInfo(api_resource=api_resource)
+        calendars_info_tool = GetCalendarsInfo(api_resource=get_api_resource())
         calendars_info = calendars_info_tool.invoke({})
         
-        toolkit = CalendarSearchEvents(api_resource=api_resource)
+        toolkit = CalendarSearchEvents(api_resource=get_api_resource())
         result = toolkit.invoke({
             "min_datetime": min_datetime,
             "max_datetime": max_datetime,
@@ -183,7 +405,9 @@ def update_calendar_event(
     """
     logger.info(f"Updating calendar event {event_id}")
     try:
-        toolkit = CalendarUpdateEvent(api_resource=api_resource)
+        from langchain_google_community.calendar.update_event import CalendarUpdateEvent
+
+        toolkit = CalendarUpdateEvent(api_resource=get_api_resource())
         update_data = {
             "event_id": event_id,
             "calendar_id": calendar_id
@@ -218,6 +442,7 @@ def update_calendar_event(
             update_data["transparency"] = transparency
             
         result = toolkit.invoke(update_data)
+        _invalidate_freebusy_cache()
         logger.info(f"Successfully updated event {event_id}")
         return result
     except Exception as e:
@@ -242,7 +467,9 @@ def delete_calendar_event(
     """
     logger.info(f"Deleting calendar event {event_id}")
     try:
-        toolkit = CalendarDeleteEvent(api_resource=api_resource)
+        from langchain_google_community.calendar.delete_event import CalendarDeleteEvent
+
+        toolkit = CalendarDeleteEvent(api_resource=get_api_resource())
         delete_data = {
             "event_id": event_id,
             "calendar_id": calendar_id
@@ -252,6 +479,7 @@ def delete_calendar_event(
             delete_data["send_updates"] = send_updates
             
         result = toolkit.invoke(delete_data)
+        _invalidate_freebusy_cache()
         logger.info(f"Successfully deleted event {event_id}")
         return result
     except Exception as e:
@@ -275,7 +503,9 @@ def get_calendars_info(calendar_id: Optional[str] = None) -> Dict:
     """
     logger.info("Fetching calendar information")
     try:
-        toolkit = GetCalendarsInfo(api_resource=api_resource)
+        from langchain_google_community.calendar.get_calendars_info import GetCalendarsInfo
+
+        toolkit = GetCalendarsInfo(api_resource=get_api_resource())
         result = toolkit.invoke({"calendar_id": calendar_id} if calendar_id else {})
         
         # If a specific calendar was requested, ensure we return a list for consistency
@@ -301,10 +531,503 @@ def get_current_datetime(calendar_id: str = "primary") -> str:
     """
     logger.info(f"Getting current datetime for calendar {calendar_id}")
     try:
-        toolkit = GetCurrentDatetime(api_resource=api_resource)
+        from langchain_google_community.calendar.current_datetime import GetCurrentDatetime
+
+        toolkit = GetCurrentDatetime(api_resource=get_api_resource())
         result = toolkit.invoke({"calendar_id": calendar_id})
         logger.info(f"Current datetime: {result}")
         return result
     except Exception as e:
         logger.error(f"Error getting current datetime: {str(e)}")
         raise
+
+
+def _get_calendar_timezones() -> Dict[str, Optional[str]]:
+    """Map every calendar ID (and the 'primary' alias) to its timezone."""
+    timezones = {}
+    calendars = get_api_resource().calendarList().list().execute()
+    for item in calendars.get("items", []):
+        timezones[item["id"]] = item.get("timeZone")
+        if item.get("primary"):
+            timezones["primary"] = item.get("timeZone")
+    return timezones
+
+
+def _to_rfc3339(value: str, tz_name: Optional[str]) -> str:
+    """Read a 'YYYY-MM-DD HH:MM:SS' wall-clock time in the calendar timezone and return RFC3339."""
+    calendar_tz = ZoneInfo(tz_name or "UTC")
+    return datetime.strptime(value, "%Y-%m-%d %H:%M:%S").replace(tzinfo=calendar_tz).isoformat()
+
+
+def _iter_calendar_pages(
+    calendar_id: str,
+    time_min: str,
+    time_max: str,
+    query: Optional[str] = None,
+    page_size: int = 250,
+    fields: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """Yield events.list result pages of a calendar in a time range."""
+    page_token = None
+    while True:
+        request = get_api_resource().events().list(
+            calendarId=calendar_id,
+            timeMin=time_min,
+            timeMax=time_max,
+            q=query,
+            singleEvents=True,
+            maxResults=page_size,
+            pageToken=page_token,
+            fields=fields
+        )
+        page = request.execute()
+        yield page
+        page_token = page.get("nextPageToken")
+        if not page_token:
+            return
+
+
+def _iter_calendar_events(
+    calendar_id: str,
+    time_min: str,
+    time_max: str,
+    query: Optional[str] = None,
+    page_size: int = 250
+) -> Iterator[Dict[str, Any]]:
+    """Yield events of a calendar in a time range, following every result page."""
+    for page in _iter_calendar_pages(calendar_id, time_min, time_max, query, page_size):
+        for event in page.get("items", []):
+            yield event
+
+
+def _has_attendee(event: Dict[str, Any], attendee: str) -> bool:
+    """Check whether an email (or part of it) is an attendee or the organizer of an event."""
+    needle = attendee.lower()
+    emails = [a.get("email", "") for a in event.get("attendees", [])]
+    emails.append(event.get("organizer", {}).get("email", ""))
+    names = [a.get("displayName", "") for a in event.get("attendees", [])]
+    return any(needle in value.lower() for value in emails + names if value)
+
+
+def _build_patch_body(event: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str, Any]:
+    """Translate bulk ``updates`` into an events.patch body for one event."""
+    body = {
+        BULK_UPDATE_FIELDS[key]: value
+        for key, value in updates.items()
+        if key in BULK_UPDATE_FIELDS
+    }
+    if updates.get("append_description"):
+        existing = event.get("description") or ""
+        separator = "\n\n" if existing else ""
+        body["description"] = existing + separator + updates["append_description"]
+    return body
+
+
+def _is_rate_limited(exception: Exception) -> bool:
+    """Check whether a batch item failed with 429 or a 403 rate limit error."""
+    status = getattr(getattr(exception, "resp", None), "status", None)
+    if status == 429:
+        return True
+    if status != 403:
+        return False
+    try:
+        errors = json.loads(exception.content).get("error", {}).get("errors", [])
+    except (AttributeError, TypeError, ValueError):
+        return False
+    return any(error.get("reason") in RATE_LIMIT_REASONS for error in errors)
+
+
+def _execute_in_batches(requests: List[Any]) -> Dict[str, Any]:
+    """Execute (key, request) pairs through batched, rate-limited HTTP requests.
+
+    Items rejected by the rate limiter are sent again in later batches, waiting
+    BULK_BACKOFF_BASE * 2**attempt seconds (plus jitter) between rounds, up to
+    BULK_MAX_RETRIES times; other errors are reported in 'failed' right away.
+    """
+    succeeded = []
+    failed = []
+    by_key = dict(requests)
+    pending = list(requests)
+
+    for attempt in range(BULK_MAX_RETRIES + 1):
+        rate_limited = []
+
+        def _callback(request_id, response, exception):
+            if exception is None:
+                succeeded.append(request_id)
+            elif _is_rate_limited(exception) and attempt < BULK_MAX_RETRIES:
+                rate_limited.append(request_id)
+            else:
+                failed.append({"id": request_id, "error": str(exception)})
+
+        for start in range(0, len(pending), BULK_BATCH_SIZE):
+            if start:
+                time.sleep(BULK_BATCH_INTERVAL)
+            batch = get_api_resource().new_batch_http_request(callback=_callback)
+            for key, request in pending[start:start + BULK_BATCH_SIZE]:
+                batch.add(request, request_id=key)
+            batch.execute()
+            logger.info(f"Executed batch {start // BULK_BATCH_SIZE + 1} ({len(succeeded)} ok, {len(failed)} failed so far)")
+
+        if not rate_limited:
+            break
+        delay = BULK_BACKOFF_BASE * 2 ** attempt + random.uniform(0, BULK_BACKOFF_BASE)
+        logger.info(f"Rate limited on {len(rate_limited)} requests, retrying in {delay:.1f}s")
+        time.sleep(delay)
+        pending = [(key, by_key[key]) for key in rate_limited]
+
+    return {"succeeded": len(succeeded), "failed": failed}
+
+@tool
+def bulk_calendar_operation(
+    action: str,
+    min_datetime: str,
+    max_datetime: str,
+    query: Optional[str] = None,
+    attendee: Optional[str] = None,
+    calendar_ids: Optional[List[str]] = None,
+    updates: Optional[Dict[str, Any]] = None,
+    send_updates: Optional[str] = None,
+    dry_run: bool = True,
+    max_events: int = 500
+) -> Dict:
+    """Apply one action to every event matching a filter, in a single step.
+
+    Use this instead of repeated update/delete calls for requests such as
+    "cancel all my 1:1s next week". Call it with dry_run=True first to show the
+    user what matches, then call it again with dry_run=False to apply.
+
+    Args:
+        action: Either 'delete' or 'update'.
+        min_datetime: The start of the range in 'YYYY-MM-DD HH:MM:SS' format.
+        max_datetime: The end of the range in 'YYYY-MM-DD HH:MM:SS' format.
+        query: Free text search terms the events must match.
+        attendee: Only match events with this attendee email (or part of it / name).
+        calendar_ids: The calendars to search (default: the primary calendar only).
+        updates: Fields to set for 'update': summary, description, location,
+                color_id, transparency, or append_description to add text
+                (e.g. a meeting link) to the existing description.
+        send_updates: Whether to send updates to attendees ('all', 'externalOnly', or 'none').
+        dry_run: Only report the matching events without changing them (default: True).
+        max_events: The maximum number of events to act on (default: 500).
+
+    Returns:
+        Dict: Summary of the matching events and, when applied, the outcome.
+    """
+    logger.info(f"Bulk {action} of events from {min_datetime} to {max_datetime} (dry_run={dry_run})")
+    if action not in ["delete", "update"]:
+        raise ValueError("action must be either 'delete' or 'update'")
+    if action == "update" and not updates:
+        raise ValueError("updates must be provided for the 'update' action")
+    unknown = set(updates or {}) - BULK_UPDATE_KEYS
+    if unknown:
+        raise ValueError(
+            f"Unknown update fields: {', '.join(sorted(unknown))}. "
+            f"Allowed: {', '.join(sorted(BULK_UPDATE_KEYS))}"
+        )
+    if action == "update" and all(value in (None, "") for value in updates.values()):
+        raise ValueError("updates must set at least one field")
+    try:
+        timezones = _get_calendar_timezones()
+        targets = calendar_ids or ["primary"]
+
+        matches = []
+        truncated = False
+        for calendar_id in targets:
+            tz_name = timezones.get(calendar_id)
+            events = _iter_calendar_events(
+                calendar_id,
+                _to_rfc3339(min_datetime, tz_name),
+                _to_rfc3339(max_datetime, tz_name),
+                query=query
+            )
+            for event in events:
+                if event.get("status") == "cancelled":
+                    continue
+                if attendee and not _has_attendee(event, attendee):
+                    continue
+                if len(matches) >= max_events:
+                    truncated = True
+                    break
+                matches.append((calendar_id, event))
+            if truncated:
+                break
+
+        summary = {
+            "action": action,
+            "dry_run": dry_run,
+            "matched": len(matches),
+            "truncated": truncated,
+            "events": [
+                {
+                    "id": event.get("id"),
+                    "calendar_id": calendar_id,
+                    "summary": event.get("summary"),
+                    "start": event.get("start", {}).get("dateTime") or event.get("start", {}).get("date"),
+                }
+                for calendar_id, event in matches[:BULK_PREVIEW_LIMIT]
+            ],
+        }
+        logger.info(f"Bulk {action} matched {len(matches)} events")
+        if dry_run or not matches:
+            return summary
+
+        requests = []
+        for calendar_id, event in matches:
+            kwargs = {"calendarId": calendar_id, "eventId": event["id"]}
+            if send_updates is not None:
+                kwargs["sendUpdates"] = send_updates
+            if action == "delete":
+                request = get_api_resource().events().delete(**kwargs)
+            else:
+                request = get_api_resource().events().patch(body=_build_patch_body(event, updates), **kwargs)
+            requests.append((f"{calendar_id}:{event['id']}", request))
+
+        try:
+            summary.update(_execute_in_batches(requests))
+        finally:
+            # Even a partly applied run has changed the calendars
+            _invalidate_freebusy_cache()
+        logger.info(f"Bulk {action} applied: {summary['succeeded']} succeeded, {len(summary['failed'])} failed")
+        return summary
+    except Exception as e:
+        logger.error(f"Error running bulk calendar operation: {str(e)}")
+        raise
+
+
+def _query_freebusy(
+    calendar_ids: List[str],
+    range_start: datetime,
+    range_end: datetime
+) -> Dict[str, Dict[str, Any]]:
+    """Fetch busy intervals per calendar, using the TTL cache and 50-calendar chunks.
+
+    Uncached calendars are fetched for whole days and at least a week ahead, so
+    nearby follow-up ranges are served from the cache.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Per calendar, 'busy' intervals and any 'errors'.
+    """
+    now = time.monotonic()
+    results = {}
+    missing = []
+    with _freebusy_cache_lock:
+        generation = _freebusy_cache_generation
+        for calendar_id, cached in list(_freebusy_cache.items()):
+            if now - cached["fetched_at"] >= FREEBUSY_CACHE_TTL:
+                del _freebusy_cache[calendar_id]
+        for calendar_id in calendar_ids:
+            cached = _freebusy_cache.get(calendar_id)
+            if cached and cached["start"] <= range_start and cached["end"] >= range_end:
+                _freebusy_cache.move_to_end(calendar_id)
+                results[calendar_id] = cached
+            else:
+                missing.append(calendar_id)
+    logger.info(f"Free/busy cache hits: {len(results)}, misses: {len(missing)}")
+
+    fetch_start = range_start.replace(hour=0, minute=0, second=0, microsecond=0)
+    fetch_end = max(range_end, fetch_start + timedelta(days=FREEBUSY_PREFETCH_DAYS))
+    for start in range(0, len(missing), FREEBUSY_MAX_CALENDARS):
+        chunk = missing[start:start + FREEBUSY_MAX_CALENDARS]
+        response = get_api_resource().freebusy().query(body={
+            "timeMin": fetch_start.isoformat(),
+            "timeMax": fetch_end.isoformat(),
+            "items": [{"id": calendar_id} for calendar_id in chunk],
+        }).execute()
+        calendars = response.get("calendars", {})
+        for calendar_id in chunk:
+            # A calendar absent from the response has unknown, not free, availability
+            data = calendars.get(calendar_id, {"errors": [{"reason": "missingFromResponse"}]})
+            entry = {
+                "fetched_at": now,
+                "start": fetch_start,
+                "end": fetch_end,
+                "busy": [
+                    (parse_rfc3339(b["start"]), parse_rfc3339(b["end"]))
+                    for b in data.get("busy", [])
+                ],
+                "errors": [e.get("reason") for e in data.get("errors", [])],
+            }
+            if not entry["errors"]:
+                with _freebusy_cache_lock:
+                    # Not cached if a write happened during the query, as it may be stale
+                    if generation == _freebusy_cache_generation:
+                        _freebusy_cache[calendar_id] = entry
+                        _freebusy_cache.move_to_end(calendar_id)
+                        while len(_freebusy_cache) > FREEBUSY_CACHE_SIZE:
+                            _freebusy_cache.popitem(last=False)
+            results[calendar_id] = entry
+    return results
+
+@tool
+def find_meeting_times(
+    attendees: List[str],
+    min_datetime: str,
+    max_datetime: str,
+    duration_minutes: int = 30,
+    timezone: Optional[str] = None,
+    working_hours: Optional[Dict[str, Dict[str, Any]]] = None,
+    max_candidates: int = 5
+) -> Dict:
+    """Find meeting times when all attendees are free, using their free/busy data.
+
+    Args:
+        attendees: Email addresses (calendar IDs) of everyone who must attend.
+                  Include 'primary' for the user.
+        min_datetime: The start of the search range in 'YYYY-MM-DD HH:MM:SS' format.
+        max_datetime: The end of the search range in 'YYYY-MM-DD HH:MM:SS' format.
+        duration_minutes: The meeting length in minutes (default: 30).
+        timezone: The timezone of the search range and results
+                 (default: the primary calendar timezone).
+        working_hours: Per-attendee working hours, keyed by email or 'default':
+                      {'start': 'HH:MM', 'end': 'HH:MM', 'timezone': <IANA name>,
+                       'days': <weekday numbers, Monday is 0>}.
+                      Defaults to 09:00-17:00, Monday to Friday.
+        max_candidates: The maximum number of slots to return (default: 5).
+
+    Returns:
+        Dict: Ranked candidate slots in 'YYYY-MM-DD HH:MM:SS' format and
+              the attendees whose availability could not be read.
+    """
+    logger.info(f"Finding meeting times for {len(attendees)} attendees from {min_datetime} to {max_datetime}")
+    try:
+        if not timezone:
+            timezone = _get_calendar_timezones().get("primary") or "UTC"
+        tz = ZoneInfo(timezone)
+        range_start = datetime.strptime(min_datetime, "%Y-%m-%d %H:%M:%S").replace(tzinfo=tz)
+        range_end = datetime.strptime(max_datetime, "%Y-%m-%d %H:%M:%S").replace(tzinfo=tz)
+        working_hours = working_hours or {}
+
+        freebusy = _query_freebusy(attendees, range_start, range_end)
+
+        windows = [(range_start, range_end)]
+        busy = []
+        for attendee in attendees:
+            hours = working_hours.get(attendee, working_hours.get("default"))
+            windows = intersect_intervals(
+                windows, working_windows(range_start, range_end, hours, timezone)
+            )
+            busy.extend(freebusy[attendee]["busy"])
+        windows = [(start.astimezone(tz), end.astimezone(tz)) for start, end in windows]
+        busy = [(start.astimezone(tz), end.astimezone(tz)) for start, end in merge_busy_intervals(busy)]
+
+        candidates = find_candidate_slots(
+            busy, windows, timedelta(minutes=duration_minutes), max_candidates=max_candidates
+        )
+        result = {
+            "timezone": timezone,
+            "duration_minutes": duration_minutes,
+            "candidates": [
+                {
+                    "start": c["start"].strftime("%Y-%m-%d %H:%M:%S"),
+                    "end": c["end"].strftime("%Y-%m-%d %H:%M:%S"),
+                    "buffer_minutes": c["buffer_minutes"],
+                }
+                for c in candidates
+            ],
+            "unavailable": {
+                attendee: data["errors"]
+                for attendee, data in freebusy.items() if data["errors"]
+            },
+        }
+        logger.info(f"Found {len(result['candidates'])} candidate slots")
+        return result
+    except Exception as e:
+        logger.error(f"Error finding meeting times: {str(e)}")
+        raise
+
+
+@tool
+def analyze_calendar(
+    min_datetime: str,
+    max_datetime: str,
+    group_by: str = "week",
+    calendar_ids: Optional[List[str]] = None,
+    query: Optional[str] = None,
+    top_n: int = 10
+) -> Dict:
+    """Summarize meeting load over a period, e.g. busy hours per week or time spent with each attendee.
+
+    Args:
+        min_datetime: The start of the period in 'YYYY-MM-DD HH:MM:SS' format.
+        max_datetime: The end of the period in 'YYYY-MM-DD HH:MM:SS' format.
+        group_by: One of 'week', 'weekday', 'hour_of_day', 'attendee' or 'calendar' (default: 'week').
+        calendar_ids: The calendars to analyze (default: the primary calendar).
+        query: Free text search terms to restrict the analyzed events.
+        top_n: For 'attendee' and 'calendar', the number of groups to return (default: 10).
+
+    Returns:
+        Dict: Total events and busy hours, and event counts and busy hours per group.
+            All-day events and events shown as available are counted separately
+            and left out of the totals and groups. Declined events are ignored,
+            and the user is not listed among the attendees.
+    """
+    logger.info(f"Analyzing calendar events from {min_datetime} to {max_datetime} by {group_by}")
+    if group_by not in ANALYZE_GROUPS:
+        raise ValueError(f"group_by must be one of: {', '.join(ANALYZE_GROUPS)}")
+    try:
+        from app.event_table import EventTableBuilder
+
+        timezones = _get_calendar_timezones()
+        tz_name = timezones.get("primary") or "UTC"
+        # Subscribed calendars (holidays, birthdays, colleagues) are only analyzed on request
+        targets = calendar_ids or ["primary"]
+
+        builder = EventTableBuilder()
+        for calendar_id in targets:
+            calendar_tz = timezones.get(calendar_id)
+            pages = _iter_calendar_pages(
+                calendar_id,
+                _to_rfc3339(min_datetime, calendar_tz),
+                _to_rfc3339(max_datetime, calendar_tz),
+                query=query,
+                fields=ANALYZE_PAGE_FIELDS
+            )
+            for page in pages:
+                builder.add_page(calendar_id, page.get("items", []), calendar_tz)
+        all_events = builder.build()
+        logger.info(f"Built event table with {len(all_events)} events ({all_events.nbytes} bytes)")
+        table = all_events.take(all_events.busy)
+
+        def _hours(seconds) -> float:
+            return round(float(seconds) / 3600, 1)
+
+        groups = []
+        if group_by == "week":
+            week_starts, counts, busy = table.group_by_week(tz_name)
+            for week_start, count, seconds in zip(week_starts, counts, busy):
+                if count:
+                    label = (datetime(1970, 1, 1) + timedelta(seconds=int(week_start))).strftime("%Y-%m-%d")
+                    groups.append({"week_start": label, "events": int(count), "busy_hours": _hours(seconds)})
+        elif group_by == "weekday":
+            counts, busy = table.group_by_weekday(tz_name)
+            for day, (count, seconds) in enumerate(zip(counts, busy)):
+                groups.append({"weekday": WEEKDAY_NAMES[day], "events": int(count), "busy_hours": _hours(seconds)})
+        elif group_by == "hour_of_day":
+            counts, busy = table.group_by_hour_of_day(tz_name)
+            for hour, (count, seconds) in enumerate(zip(counts, busy)):
+                if count:
+                    groups.append({"hour": f"{hour:02d}:00", "events": int(count), "busy_hours": _hours(seconds)})
+        else:
+            if group_by == "attendee":
+                counts, busy = table.group_by_attendee()
+                names = table.attendee_pool.values
+            else:
+                counts, busy = table.group_by_calendar()
+                names = table.calendar_pool.values
+            for code in busy.argsort()[::-1][:top_n]:
+                if counts[code]:
+                    groups.append({group_by: names[code], "events": int(counts[code]), "busy_hours": _hours(busy[code])})
+
+        return {
+            "timezone": tz_name,
+            "events": len(table),
+            "busy_hours": _hours(table.duration.sum()),
+            "all_day_events": int(all_events.all_day.sum()),
+            "free_events": int((all_events.transparent & ~all_events.all_day).sum()),
+            "group_by": group_by,
+            "groups": groups,
+        }
+    except Exception as e:
+        logger.error(f"Error analyzing calendar: {str(e)}")
+        raise
@@ -0,0 +1,153 @@
+# app/compact_tools.py
+"""Compact variants of the calendar tools.
+
+The tools in app.calendar_tools carry long docstrings and many top-level
+optional parameters, all of which are sent as JSON schema on every model call.
+The variants here keep the same tool names and behaviour but have one-line
+descriptions and group rarely used fields into a single ``options`` object.
+``select_tools`` (from app.tool_selection) picks the subset of tools relevant
+to a query with keyword rules, so each turn only ships the schemas it is likely
+to need.
+"""
+import json
+from typing import Any, Dict, List, Optional
+
+from langchain_core.tools import tool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from app import calendar_tools
+from app.tool_selection import BASE_TOOLS, TOOL_INTENTS, select_tools  # noqa: F401
+
+DATETIME_HINT = "'YYYY-MM-DD HH:MM:SS'"
+
+# Short system prompt replacing the formatting HumanMessage in compact mode
+COMPACT_SYSTEM_PROMPT = (
+    f"Datetimes use {DATETIME_HINT}. If an event end is not given, use start + 1 hour. "
+    "Search for an event to get its id before updating or deleting it."
+)
+
+
+def _merge_options(args: Dict[str, Any], options: Optional[Dict[str, Any]], allowed: List[str]) -> Dict[str, Any]:
+    """Merge the grouped ``options`` object into top-level tool arguments."""
+    for key, value in (options or {}).items():
+        if key not in allowed:
+            raise ValueError(f"Unknown option '{key}'. Allowed: {', '.join(allowed)}")
+        args[key] = value
+    return args
+
+
+CREATE_OPTIONS = [
+    "calendar_id", "description", "location", "attendees", "color_id",
+    "conference_data", "recurrence", "reminders", "transparency",
+]
+UPDATE_OPTIONS = CREATE_OPTIONS + ["summary", "start_datetime", "end_datetime", "timezone", "send_updates"]
+SEARCH_OPTIONS = ["query", "max_results", "order_by", "single_events"]
+BULK_OPTIONS = ["query", "attendee", "calendar_ids", "updates", "send_updates", "max_events"]
+MEETING_OPTIONS = ["duration_minutes", "timezone", "working_hours", "max_candidates"]
+ANALYZE_OPTIONS = ["calendar_ids", "query", "top_n"]
+
+
+@tool("create_calendar_event")
+def create_event(
+    summary: str,
+    start_datetime: str,
+    end_datetime: str,
+    timezone: str = "UTC",
+    options: Optional[Dict[str, Any]] = None
+) -> Dict:
+    """Create an event. Times 'YYYY-MM-DD HH:MM:SS' or 'YYYY-MM-DD' (all-day). options: calendar_id, description, location, attendees (emails), color_id, conference_data (bool), recurrence ({'FREQ','INTERVAL','COUNT','UNTIL','BYDAY'}), reminders, transparency."""
+    args = {"summary": summary, "start_datetime": start_datetime, "end_datetime": end_datetime, "timezone": timezone}
+    return calendar_tools.create_calendar_event.invoke(_merge_options(args, options, CREATE_OPTIONS))
+
+
+@tool("search_calendar_events")
+def search_events(min_datetime: str, max_datetime: str, options: Optional[Dict[str, Any]] = None) -> List[Dict]:
+    """Search events between two 'YYYY-MM-DD HH:MM:SS' times. options: query (free text), max_results (10), order_by, single_events."""
+    args = {"min_datetime": min_datetime, "max_datetime": max_datetime}
+    return calendar_tools.search_calendar_events.invoke(_merge_options(args, options, SEARCH_OPTIONS))
+
+
+@tool("update_calendar_event")
+def update_event(event_id: str, changes: Dict[str, Any]) -> Dict:
+    """Update an event by id. changes: calendar_id, summary, start_datetime, end_datetime, timezone, description, location, attendees, color_id, conference_data, recurrence, reminders, send_updates, transparency."""
+    return calendar_tools.update_calendar_event.invoke(_merge_options({"event_id": event_id}, changes, UPDATE_OPTIONS))
+
+
+@tool("delete_calendar_event")
+def delete_event(event_id: str, calendar_id: str = "primary", send_updates: Optional[str] = None) -> Dict:
+    """Delete an event by id. send_updates: 'all', 'externalOnly' or 'none'."""
+    return calendar_tools.delete_calendar_event.invoke(
+        {"event_id": event_id, "calendar_id": calendar_id, "send_updates": send_updates}
+    )
+
+
+@tool("get_calendars_info")
+def calendars_info(calendar_id: Optional[str] = None) -> Dict:
+    """List calendars (id, summary, timeZone), or one calendar by id."""
+    return calendar_tools.get_calendars_info.invoke({"calendar_id": calendar_id})
+
+
+@tool("get_current_datetime")
+def current_datetime(calendar_id: str = "primary") -> str:
+    """Current datetime and timezone of a calendar."""
+    return calendar_tools.get_current_datetime.invoke({"calendar_id": calendar_id})
+
+
+@tool("bulk_calendar_operation")
+def bulk_operation(
+    action: str,
+    min_datetime: str,
+    max_datetime: str,
+    dry_run: bool = True,
+    options: Optional[Dict[str, Any]] = None
+) -> Dict:
+    """Delete or update all events matching a filter in one call; run dry_run=True first. action: 'delete' or 'update'. options: query, attendee, calendar_ids, updates ({summary, description, location, color_id, transparency, append_description}), send_updates, max_events."""
+    args = {"action": action, "min_datetime": min_datetime, "max_datetime": max_datetime, "dry_run": dry_run}
+    return calendar_tools.bulk_calendar_operation.invoke(_merge_options(args, options, BULK_OPTIONS))
+
+
+@tool("find_meeting_times")
+def meeting_times(
+    attendees: List[str],
+    min_datetime: str,
+    max_datetime: str,
+    options: Optional[Dict[str, Any]] = None
+) -> Dict:
+    """Find slots when all attendees (emails, 'primary' for the user) are free. options: duration_minutes (30), timezone, working_hours ({email or 'default': {start, end, timezone, days}}), max_candidates."""
+    args = {"attendees": attendees, "min_datetime": min_datetime, "max_datetime": max_datetime}
+    return calendar_tools.find_meeting_times.invoke(_merge_options(args, options, MEETING_OPTIONS))
+
+
+@tool("analyze_calendar")
+def analyze(
+    min_datetime: str,
+    max_datetime: str,
+    group_by: str = "week",
+    options: Optional[Dict[str, Any]] = None
+) -> Dict:
+    """Meeting counts and busy hours over a period. group_by: week, weekday, hour_of_day, attendee or calendar. options: calendar_ids, query, top_n (10)."""
+    args = {"min_datetime": min_datetime, "max_datetime": max_datetime, "group_by": group_by}
+    return calendar_tools.analyze_calendar.invoke(_merge_options(args, options, ANALYZE_OPTIONS))
+
+
+COMPACT_TOOLS = [
+    search_events,
+    create_event,
+    update_event,
+    delete_event,
+    calendars_info,
+    current_datetime,
+    bulk_operation,
+    meeting_times,
+    analyze,
+]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token) for size comparisons."""
+    return max(1, len(text) // 4)
+
+
+def estimate_tool_schema_tokens(tools: List[Any]) -> int:
+    """Estimate the prompt tokens taken by the JSON schemas of a list of tools."""
+    return sum(estimate_tokens(json.dumps(convert_to_openai_tool(t))) for t in tools)
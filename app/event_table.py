@@ -0,0 +1,311 @@
+# app/event_table.py
+"""Compact columnar representation of calendar events for analytics.
+
+A list of Google event dicts costs a few kilobytes per event. EventTable keeps
+only what analytics need, in flat arrays: int64 epoch-second start/end times,
+all-day and transparent ("show as available") flags, calendar and summary codes
+into interned string pools, and attendees as a CSR-style offsets/codes pair. Range filters, overlap counts and group-by
+aggregations are vectorized with numpy.
+
+Build a table page by page straight from events.list responses:
+
+    builder = EventTableBuilder()
+    for page in pages:
+        builder.add_page(calendar_id, page["items"], tz_name)
+    table = builder.build()
+"""
+from array import array
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from app.scheduling import parse_rfc3339
+
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_DAY = 24 * SECONDS_PER_HOUR
+# 1970-01-01 was a Thursday; shifting by three days puts week boundaries on Mondays
+WEEK_EPOCH_SHIFT = 3 * SECONDS_PER_DAY
+
+
+class StringPool:
+    """Interns strings to dense integer codes."""
+
+    def __init__(self):
+        self._codes: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def intern(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+
+    def code(self, value: str) -> Optional[int]:
+        """Return the code of a string, or None if it was never interned."""
+        return self._codes.get(value)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class EventTableBuilder:
+    """Accumulates events into growable typed buffers and produces an EventTable."""
+
+    def __init__(self):
+        self._start = array("q")
+        self._end = array("q")
+        self._all_day = array("b")
+        self._transparent = array("b")
+        self._calendar = array("i")
+        self._summary = array("i")
+        self._attendee_offsets = array("q", [0])
+        self._attendees = array("i")
+        self.calendars = StringPool()
+        self.summaries = StringPool()
+        self.attendees = StringPool()
+
+    def add_event(self, calendar_id: str, event: Dict[str, Any], tz_name: Optional[str] = None) -> None:
+        """Append one Google event dict.
+
+        Cancelled events, events the calendar owner declined and events without
+        times are skipped. The owner (the attendee marked 'self') is not added
+        to the attendees, since they are on nearly every event.
+        """
+        if event.get("status") == "cancelled":
+            return
+        attendees = event.get("attendees", [])
+        if any(a.get("self") and a.get("responseStatus") == "declined" for a in attendees):
+            return
+        start = _to_epoch(event.get("start", {}), tz_name)
+        end = _to_epoch(event.get("end", {}), tz_name)
+        if start is None or end is None:
+            return
+        self._start.append(start)
+        self._end.append(end)
+        self._all_day.append("date" in event.get("start", {}) and "dateTime" not in event["start"])
+        self._transparent.append(event.get("transparency") == "transparent")
+        self._calendar.append(self.calendars.intern(calendar_id))
+        self._summary.append(self.summaries.intern(event.get("summary") or ""))
+        for attendee in attendees:
+            if attendee.get("email") and not attendee.get("self"):
+                self._attendees.append(self.attendees.intern(attendee["email"].lower()))
+        self._attendee_offsets.append(len(self._attendees))
+
+    def add_page(self, calendar_id: str, items: Iterable[Dict[str, Any]], tz_name: Optional[str] = None) -> None:
+        """Append the items of one events.list page."""
+        for event in items:
+            self.add_event(calendar_id, event, tz_name)
+
+    def build(self) -> "EventTable":
+        return EventTable(
+            start=np.frombuffer(self._start, dtype=np.int64).copy(),
+            end=np.frombuffer(self._end, dtype=np.int64).copy(),
+            all_day=np.frombuffer(self._all_day, dtype=np.int8).astype(bool),
+            transparent=np.frombuffer(self._transparent, dtype=np.int8).astype(bool),
+            calendar=np.frombuffer(self._calendar, dtype=np.int32).copy(),
+            summary=np.frombuffer(self._summary, dtype=np.int32).copy(),
+            attendee_offsets=np.frombuffer(self._attendee_offsets, dtype=np.int64).copy(),
+            attendees=np.frombuffer(self._attendees, dtype=np.int32).copy(),
+            calendar_pool=self.calendars,
+            summary_pool=self.summaries,
+            attendee_pool=self.attendees,
+        )
+
+
+def _to_epoch(value: Dict[str, str], tz_name: Optional[str]) -> Optional[int]:
+    """Convert an event start/end ({'dateTime'} or all-day {'date'}) to epoch seconds."""
+    if value.get("dateTime"):
+        return int(parse_rfc3339(value["dateTime"]).timestamp())
+    if value.get("date"):
+        day = date.fromisoformat(value["date"])
+        tz = ZoneInfo(tz_name or value.get("timeZone") or "UTC")
+        return int(datetime(day.year, day.month, day.day, tzinfo=tz).timestamp())
+    return None
+
+
+class EventTable:
+    """Array-backed table of events.
+
+    Attributes:
+        start, end: int64 epoch seconds per event.
+        all_day, transparent: bool per event; all-day events and events shown
+            as available do not make their owner busy.
+        calendar, summary: int32 codes into calendar_pool / summary_pool.
+        attendee_offsets, attendees: attendees of event i are
+            attendees[attendee_offsets[i]:attendee_offsets[i + 1]], as codes
+            into attendee_pool.
+    """
+
+    def __init__(
+        self,
+        start: np.ndarray,
+        end: np.ndarray,
+        all_day: np.ndarray,
+        transparent: np.ndarray,
+        calendar: np.ndarray,
+        summary: np.ndarray,
+        attendee_offsets: np.ndarray,
+        attendees: np.ndarray,
+        calendar_pool: StringPool,
+        summary_pool: StringPool,
+        attendee_pool: StringPool
+    ):
+        self.start = start
+        self.end = end
+        self.all_day = all_day
+        self.transparent = transparent
+        self.calendar = calendar
+        self.summary = summary
+        self.attendee_offsets = attendee_offsets
+        self.attendees = attendees
+        self.calendar_pool = calendar_pool
+        self.summary_pool = summary_pool
+        self.attendee_pool = attendee_pool
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the arrays (string pools not included)."""
+        return sum(a.nbytes for a in (
+            self.start, self.end, self.all_day, self.transparent,
+            self.calendar, self.summary, self.attendee_offsets, self.attendees
+        ))
+
+    @property
+    def duration(self) -> np.ndarray:
+        return self.end - self.start
+
+    def overlapping(self, start: int, end: int) -> np.ndarray:
+        """Boolean mask of events overlapping [start, end)."""
+        return (self.start < end) & (self.end > start)
+
+    def take(self, mask: np.ndarray) -> "EventTable":
+        """Return a new table with the events selected by a boolean mask."""
+        counts = np.diff(self.attendee_offsets)
+        offsets = np.zeros(int(mask.sum()) + 1, dtype=np.int64)
+        np.cumsum(counts[mask], out=offsets[1:])
+        return EventTable(
+            start=self.start[mask],
+            end=self.end[mask],
+            all_day=self.all_day[mask],
+            transparent=self.transparent[mask],
+            calendar=self.calendar[mask],
+            summary=self.summary[mask],
+            attendee_offsets=offsets,
+            attendees=self.attendees[np.repeat(mask, counts)],
+            calendar_pool=self.calendar_pool,
+            summary_pool=self.summary_pool,
+            attendee_pool=self.attendee_pool,
+        )
+
+    @property
+    def busy(self) -> np.ndarray:
+        """Boolean mask of timed events that block time (not all-day, not transparent)."""
+        return ~(self.all_day | self.transparent)
+
+    def filter_range(self, start: int, end: int) -> "EventTable":
+        """Return the events overlapping [start, end)."""
+        return self.take(self.overlapping(start, end))
+
+    def overlap_counts(self, edges: np.ndarray) -> np.ndarray:
+        """Count the events overlapping each bin [edges[i], edges[i + 1]).
+
+        Uses two binary searches over sorted starts and ends instead of
+        comparing every event with every bin.
+        """
+        starts = np.sort(self.start)
+        ends = np.sort(self.end)
+        started = np.searchsorted(starts, edges[1:], side="left")
+        finished = np.searchsorted(ends, edges[:-1], side="right")
+        return started - finished
+
+    def busy_seconds(self, edges: np.ndarray) -> np.ndarray:
+        """Total event time (seconds, overlapping events counted separately) inside each bin."""
+        totals = np.zeros(len(edges) - 1, dtype=np.int64)
+        for i in range(len(edges) - 1):
+            clipped = np.minimum(self.end, edges[i + 1]) - np.maximum(self.start, edges[i])
+            totals[i] = clipped[clipped > 0].sum()
+        return totals
+
+    def local_seconds(self, tz_name: str) -> np.ndarray:
+        """Event starts as seconds since the epoch in local wall-clock time.
+
+        UTC offsets are looked up once per day of the table's span. On days
+        where the offset changes, the transition instant is found by binary
+        search, so shifts at any time of day (e.g. Lord Howe's 30 minutes)
+        are exact without a per-event datetime conversion.
+        """
+        if not len(self):
+            return self.start.copy()
+        tz = ZoneInfo(tz_name)
+
+        def offset(epoch: int) -> int:
+            return int(datetime.fromtimestamp(epoch, tz).utcoffset().total_seconds())
+
+        first_day = int(self.start.min()) // SECONDS_PER_DAY
+        last_day = int(self.start.max()) // SECONDS_PER_DAY
+        day_offsets = [offset(day * SECONDS_PER_DAY) for day in range(first_day, last_day + 2)]
+        days = self.start // SECONDS_PER_DAY - first_day
+        offsets = np.array(day_offsets[:-1], dtype=np.int64)[days]
+        for i in range(len(day_offsets) - 1):
+            if day_offsets[i] != day_offsets[i + 1]:
+                lo = (first_day + i) * SECONDS_PER_DAY
+                hi = lo + SECONDS_PER_DAY
+                while hi - lo > 1:
+                    mid = (lo + hi) // 2
+                    if offset(mid) == day_offsets[i]:
+                        lo = mid
+                    else:
+                        hi = mid
+                offsets[(days == i) & (self.start >= hi)] = day_offsets[i + 1]
+        return self.start + offsets
+
+    def group_by_hour_of_day(self, tz_name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Event counts and busy seconds per local start hour (0-23)."""
+        hours = (self.local_seconds(tz_name) % SECONDS_PER_DAY) // SECONDS_PER_HOUR
+        return np.bincount(hours, minlength=24), np.bincount(hours, weights=self.duration, minlength=24)
+
+    def group_by_weekday(self, tz_name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Event counts and busy seconds per local start weekday (Monday is 0)."""
+        days = (self.local_seconds(tz_name) + WEEK_EPOCH_SHIFT) // SECONDS_PER_DAY % 7
+        return np.bincount(days, minlength=7), np.bincount(days, weights=self.duration, minlength=7)
+
+    def group_by_week(self, tz_name: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Event counts and busy seconds per local week starting on Monday.
+
+        Returns:
+            Tuple: (week start as local epoch seconds, counts, busy seconds)
+        """
+        weeks = (self.local_seconds(tz_name) + WEEK_EPOCH_SHIFT) // (7 * SECONDS_PER_DAY)
+        if not len(weeks):
+            return weeks, weeks, weeks
+        first = int(weeks.min())
+        index = weeks - first
+        counts = np.bincount(index)
+        busy = np.bincount(index, weights=self.duration)
+        week_starts = (np.arange(len(counts)) + first) * 7 * SECONDS_PER_DAY - WEEK_EPOCH_SHIFT
+        return week_starts, counts, busy
+
+    def group_by_attendee(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Meeting counts and meeting seconds per attendee code."""
+        per_event = np.diff(self.attendee_offsets)
+        durations = np.repeat(self.duration, per_event)
+        size = len(self.attendee_pool)
+        return (
+            np.bincount(self.attendees, minlength=size),
+            np.bincount(self.attendees, weights=durations, minlength=size),
+        )
+
+    def group_by_calendar(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Event counts and busy seconds per calendar code."""
+        size = len(self.calendar_pool)
+        return (
+            np.bincount(self.calendar, minlength=size),
+            np.bincount(self.calendar, weights=self.duration, minlength=size),
+        )
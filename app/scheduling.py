@@ -0,0 +1,162 @@
+"""Free/busy interval helpers used to find meeting times for several attendees."""
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+Interval = Tuple[datetime, datetime]
+
+DEFAULT_WORKING_HOURS = {"start": "09:00", "end": "17:00", "days": [0, 1, 2, 3, 4]}
+
+
+def parse_rfc3339(value: str) -> datetime:
+    """Parse an RFC3339 timestamp as returned by the Calendar API."""
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+def merge_busy_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Merge overlapping or touching busy intervals with a sweep line.
+
+    Each interval contributes a +1 event at its start and a -1 event at its end;
+    starts sort before ends at the same instant so back-to-back meetings merge.
+
+    Args:
+        intervals: Busy intervals, in any order, as (start, end) pairs.
+
+    Returns:
+        List[Interval]: Disjoint busy intervals sorted by start.
+    """
+    events = []
+    for start, end in intervals:
+        if end > start:
+            events.append((start, 0, 1))
+            events.append((end, 1, -1))
+    events.sort()
+
+    merged = []
+    depth = 0
+    current_start = None
+    for instant, _, delta in events:
+        if depth == 0 and delta == 1:
+            current_start = instant
+        depth += delta
+        if depth == 0:
+            merged.append((current_start, instant))
+    return merged
+
+
+def intersect_intervals(first: List[Interval], second: List[Interval]) -> List[Interval]:
+    """Intersect two sorted lists of disjoint intervals."""
+    result = []
+    i = j = 0
+    while i < len(first) and j < len(second):
+        start = max(first[i][0], second[j][0])
+        end = min(first[i][1], second[j][1])
+        if start < end:
+            result.append((start, end))
+        if first[i][1] < second[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def subtract_intervals(windows: List[Interval], busy: List[Interval]) -> List[Interval]:
+    """Remove sorted, disjoint busy intervals from sorted, disjoint windows."""
+    result = []
+    j = 0
+    for start, end in windows:
+        cursor = start
+        while j < len(busy) and busy[j][1] <= cursor:
+            j += 1
+        k = j
+        while k < len(busy) and busy[k][0] < end:
+            if busy[k][0] > cursor:
+                result.append((cursor, busy[k][0]))
+            cursor = max(cursor, busy[k][1])
+            k += 1
+        if cursor < end:
+            result.append((cursor, end))
+    return result
+
+
+def working_windows(
+    range_start: datetime,
+    range_end: datetime,
+    working_hours: Optional[Dict[str, Any]] = None,
+    default_timezone: str = "UTC"
+) -> List[Interval]:
+    """Build the working-hour windows of one attendee inside a time range.
+
+    Args:
+        range_start: Aware start of the search range.
+        range_end: Aware end of the search range.
+        working_hours: {'start': 'HH:MM', 'end': 'HH:MM', 'timezone': <IANA name>,
+                       'days': <weekday numbers, Monday is 0>}. Missing keys
+                       fall back to 09:00-17:00, Monday to Friday.
+        default_timezone: Timezone used when working_hours has none.
+
+    Returns:
+        List[Interval]: Sorted windows, clipped to the search range.
+    """
+    hours = dict(DEFAULT_WORKING_HOURS, **(working_hours or {}))
+    tz = ZoneInfo(hours.get("timezone") or default_timezone)
+    start_hour, start_minute = (int(part) for part in hours["start"].split(":"))
+    end_hour, end_minute = (int(part) for part in hours["end"].split(":"))
+
+    windows = []
+    day = range_start.astimezone(tz).date() - timedelta(days=1)
+    last_day = range_end.astimezone(tz).date()
+    while day <= last_day:
+        if day.weekday() in hours["days"]:
+            start = datetime(day.year, day.month, day.day, start_hour, start_minute, tzinfo=tz)
+            end = datetime(day.year, day.month, day.day, end_hour, end_minute, tzinfo=tz)
+            start, end = max(start, range_start), min(end, range_end)
+            if start < end:
+                windows.append((start, end))
+        day += timedelta(days=1)
+    return windows
+
+
+def find_candidate_slots(
+    busy: List[Interval],
+    windows: List[Interval],
+    duration: timedelta,
+    step: timedelta = timedelta(minutes=30),
+    max_candidates: int = 5
+) -> List[Dict[str, Any]]:
+    """Rank meeting slots of a given duration that fit in everyone's free time.
+
+    Slots are aligned to ``step`` inside each free interval. They are ranked by
+    day first, then by the breathing room they leave before the neighbouring
+    busy blocks (capped at one hour), then by start time.
+
+    Args:
+        busy: Merged busy intervals of all attendees.
+        windows: Intersection of all attendees' working windows.
+        duration: Length of the meeting.
+        step: Granularity of candidate start times.
+        max_candidates: The maximum number of slots to return.
+
+    Returns:
+        List[Dict[str, Any]]: Candidates with 'start', 'end' and 'buffer_minutes'.
+    """
+    cap = timedelta(hours=1)
+    candidates = []
+    for free_start, free_end in subtract_intervals(windows, busy):
+        epoch = datetime(1970, 1, 1, tzinfo=free_start.tzinfo)
+        offset = (free_start - epoch) % step
+        slot_start = free_start if not offset else free_start + (step - offset)
+        while slot_start + duration <= free_end:
+            slot_end = slot_start + duration
+            buffer = min(slot_start - free_start, free_end - slot_end, cap)
+            candidates.append({
+                "start": slot_start,
+                "end": slot_end,
+                "buffer_minutes": int(buffer.total_seconds() // 60),
+            })
+            slot_start += step
+
+    candidates.sort(key=lambda c: (c["start"].date(), -c["buffer_minutes"], c["start"]))
+    return candidates[:max_candidates]
@@ -0,0 +1,454 @@
+# app/server.py
+"""Headless ASGI server exposing CalendarAgent over HTTP and WebSocket.
+
+Run several workers with, for example:
+
+    uvicorn app.server:app --workers 4 --port 8000
+
+Endpoints:
+    GET  /health       liveness probe
+    POST /v1/chat      {"user_id": ..., "message": ..., "turn_id": optional}; streams NDJSON events
+    WS   /v1/ws        ?user_id=...; send {"message": ..., "turn_id": optional}, receive JSON events
+
+Clients retrying a turn should resend the same turn_id so events created by
+the first attempt are not created again.
+
+Conversation history lives in the configured session store (see
+app.session_store), so any worker can serve any turn of a user.
+"""
+import asyncio
+import json
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from app.session_store import SessionStore, get_session_store
+from config.logger_config import setup_logger
+
+# Set up logger
+logger = setup_logger(__name__)
+
+MAX_CONCURRENCY = int(os.getenv("SERVER_MAX_CONCURRENCY", "8"))
+MAX_QUEUE = int(os.getenv("SERVER_MAX_QUEUE", "32"))
+PER_USER_CONCURRENCY = int(os.getenv("SERVER_PER_USER_CONCURRENCY", "1"))
+PER_USER_MAX_PENDING = int(os.getenv("SERVER_PER_USER_MAX_PENDING", "4"))
+# How long a turn waits for a user's slot held by another worker before a 429
+TURN_WAIT_SECONDS = float(os.getenv("SERVER_TURN_WAIT_SECONDS", "30"))
+TURN_POLL_INTERVAL = 0.25
+
+
+class Overloaded(Exception):
+    """Raised when a request is rejected to apply backpressure."""
+
+    def __init__(self, status: int, reason: str):
+        super().__init__(reason)
+        self.status = status
+        self.reason = reason
+
+
+class AdmissionController:
+    """Bounded request queue with a global concurrency cap and per-user limits.
+
+    Requests beyond a user's pending limit get 429; requests arriving while
+    every slot is busy and the queue is full get 503.
+
+    The global cap and the pending limit are per worker. With a session store,
+    a user's concurrency limit is also enforced across workers through the
+    store's turn slots, so turns of one user never read and append the shared
+    history concurrently.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = MAX_CONCURRENCY,
+        max_queue: int = MAX_QUEUE,
+        per_user_concurrency: int = PER_USER_CONCURRENCY,
+        per_user_max_pending: int = PER_USER_MAX_PENDING,
+        store: Optional[SessionStore] = None,
+        turn_wait: float = TURN_WAIT_SECONDS
+    ):
+        self.max_queue = max_queue
+        self.per_user_concurrency = per_user_concurrency
+        self.per_user_max_pending = per_user_max_pending
+        self.store = store
+        self.turn_wait = turn_wait
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._waiting = 0
+        self._pending: Dict[str, int] = defaultdict(int)
+        self._user_slots: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def waiting(self) -> int:
+        """Number of admitted requests waiting for a slot."""
+        return self._waiting
+
+    async def _acquire_turn(self, user_id: str) -> Any:
+        """Wait for a turn slot of the user in the shared store, if there is one."""
+        if self.store is None:
+            return None
+        deadline = asyncio.get_running_loop().time() + self.turn_wait
+        while True:
+            attempt = asyncio.ensure_future(asyncio.to_thread(self.store.acquire_turn, user_id, self.per_user_concurrency))
+            try:
+                token = await asyncio.shield(attempt)
+            except asyncio.CancelledError:
+                # The thread may still take the slot; hand it back when it does
+                def release_late(future):
+                    if not future.exception() and future.result() is not None:
+                        self.store.release_turn(user_id, future.result())
+
+                attempt.add_done_callback(release_late)
+                raise
+            if token is not None:
+                return token
+            if asyncio.get_running_loop().time() >= deadline:
+                raise Overloaded(429, "Too many concurrent requests for this user")
+            await asyncio.sleep(TURN_POLL_INTERVAL)
+
+    @asynccontextmanager
+    async def admit(self, user_id: str) -> AsyncIterator[None]:
+        if self._pending.get(user_id, 0) >= self.per_user_max_pending:
+            raise Overloaded(429, "Too many concurrent requests for this user")
+        if self._waiting >= self.max_queue:
+            raise Overloaded(503, "Server is busy, retry later")
+
+        self._pending[user_id] += 1
+        self._waiting += 1
+        queued = True
+        user_slots = self._user_slots.setdefault(user_id, asyncio.Semaphore(self.per_user_concurrency))
+        try:
+            async with user_slots:
+                token = await self._acquire_turn(user_id)
+                try:
+                    async with self._slots:
+                        self._waiting -= 1
+                        queued = False
+                        yield
+                finally:
+                    if token is not None:
+                        await asyncio.to_thread(self.store.release_turn, user_id, token)
+        finally:
+            if queued:
+                self._waiting -= 1
+            self._pending[user_id] -= 1
+            if not self._pending[user_id]:
+                del self._pending[user_id]
+                self._user_slots.pop(user_id, None)
+
+
+_agent = None
+_agent_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY, thread_name_prefix="agent")
+_admission: Optional[AdmissionController] = None
+_store = None
+
+
+def get_agent():
+    """Return the worker's CalendarAgent, creating it on first use."""
+    global _agent
+    with _agent_lock:
+        if _agent is None:
+            from app.app import CalendarAgent
+
+            logger.info("Initializing CalendarAgent for server worker")
+            _agent = CalendarAgent()
+    return _agent
+
+
+def _get_admission() -> AdmissionController:
+    # Created lazily so the semaphores belong to the server's event loop
+    global _admission
+    if _admission is None:
+        _admission = AdmissionController(store=_get_store())
+    return _admission
+
+
+def _get_store():
+    global _store
+    if _store is None:
+        _store = get_session_store()
+    return _store
+
+
+async def _wait_for_thread(future: "asyncio.Future[Any]") -> None:
+    """Wait for an executor future to finish, even if the waiting task is cancelled.
+
+    Re-raises the cancellation once the future is done.
+    """
+    cancelled = False
+    while not future.done():
+        try:
+            await asyncio.shield(future)
+        except asyncio.CancelledError:
+            cancelled = True
+    if cancelled:
+        raise asyncio.CancelledError
+
+
+async def run_turn(user_id: str, message: str, turn_id: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Run one conversation turn and yield agent events as they are produced.
+
+    Raises:
+        Overloaded: If the request is rejected by the admission controller.
+    """
+    loop = asyncio.get_running_loop()
+    store = _get_store()
+    async with _get_admission().admit(user_id):
+        history = await loop.run_in_executor(_executor, store.get_history, user_id)
+        queue: asyncio.Queue = asyncio.Queue()
+        # Set when the consumer goes away, so the agent stops at its next event
+        stop = threading.Event()
+
+        def produce():
+            try:
+                for event in get_agent().stream_message(message, history, turn_id):
+                    if stop.is_set():
+                        logger.info(f"Client for {user_id} went away, stopping the turn")
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, event)
+            except Exception as e:
+                logger.error(f"Error processing message for {user_id}: {str(e)}")
+                loop.call_soon_threadsafe(queue.put_nowait, {"type": "error", "error": str(e)})
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+
+        producer = loop.run_in_executor(_executor, produce)
+        reply = None
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                if event["type"] == "message":
+                    reply = event["content"]
+                yield event
+        finally:
+            stop.set()
+            # Keep the admission slot until the agent thread has finished, even when
+            # the consumer closed or cancelled the turn; an LLM or tool call already
+            # in flight cannot be interrupted and still counts against the limits
+            await _wait_for_thread(producer)
+
+        if reply is not None:
+            await loop.run_in_executor(_executor, store.append, user_id, [
+                {"role": "user", "content": message},
+                {"role": "assistant", "content": reply},
+            ])
+
+
+async def _read_body(receive) -> bytes:
+    body = b""
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+    return body
+
+
+async def _watch_disconnect(receive, backlog: List[Dict[str, Any]]) -> None:
+    """Read ASGI messages until the client disconnects, keeping any others in backlog."""
+    while True:
+        message = await receive()
+        if message["type"] in ("http.disconnect", "websocket.disconnect"):
+            return
+        backlog.append(message)
+
+
+_DISCONNECTED = object()
+
+
+async def _next_event(events: AsyncIterator[Dict[str, Any]], disconnected: "asyncio.Task[None]") -> Any:
+    """Return the next event of a turn, or _DISCONNECTED if the client goes away first.
+
+    On disconnect the pending step is cancelled, which stops the turn and
+    waits for its agent thread.
+
+    Raises:
+        StopAsyncIteration: At the end of the turn.
+    """
+    step = asyncio.ensure_future(events.__anext__())
+    await asyncio.wait({step, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+    if step.done():
+        return step.result()
+    step.cancel()
+    try:
+        await step
+    except (asyncio.CancelledError, StopAsyncIteration):
+        pass
+    return _DISCONNECTED
+
+
+async def _send_json(send, status: int, payload: Dict[str, Any], headers: Optional[List[Tuple[bytes, bytes]]] = None) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json")] + (headers or []),
+    })
+    await send({"type": "http.response.body", "body": json.dumps(payload).encode("utf-8")})
+
+
+async def _handle_chat(scope, receive, send) -> None:
+    try:
+        payload = json.loads(await _read_body(receive) or b"{}")
+    except ValueError:
+        payload = None
+    if not isinstance(payload, dict):
+        await _send_json(send, 400, {"error": "Request body must be a JSON object"})
+        return
+    headers = dict(scope.get("headers", []))
+    user_id = str(payload.get("user_id") or headers.get(b"x-user-id", b"").decode("utf-8"))
+    message = str(payload.get("message") or "").strip()
+    if not user_id or not message:
+        await _send_json(send, 400, {"error": "Both user_id and message are required"})
+        return
+
+    events = run_turn(user_id, message, payload.get("turn_id"))
+    # Servers report a closed connection as http.disconnect rather than by failing send()
+    disconnected = asyncio.ensure_future(_watch_disconnect(receive, []))
+    # Closing the generator releases the admission slot even if the client disconnects
+    try:
+        try:
+            event = await _next_event(events, disconnected)
+        except Overloaded as e:
+            await _send_json(send, e.status, {"error": e.reason}, [(b"retry-after", b"1")])
+            return
+        except StopAsyncIteration:
+            event = None
+        if event is _DISCONNECTED:
+            logger.info(f"Client for {user_id} disconnected while queued")
+            return
+
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/x-ndjson"), (b"cache-control", b"no-cache")],
+        })
+        while event is not None:
+            await send({"type": "http.response.body", "body": json.dumps(event).encode("utf-8") + b"\n", "more_body": True})
+            try:
+                event = await _next_event(events, disconnected)
+            except StopAsyncIteration:
+                event = None
+            if event is _DISCONNECTED:
+                logger.info(f"Client for {user_id} disconnected, stopped the turn")
+                return
+        await send({"type": "http.response.body", "body": json.dumps({"type": "done"}).encode("utf-8") + b"\n"})
+    finally:
+        disconnected.cancel()
+        await events.aclose()
+
+
+async def _handle_websocket(scope, receive, send) -> None:
+    query = parse_qs(scope.get("query_string", b"").decode("utf-8"))
+    user_id = (query.get("user_id") or [""])[0]
+    message = await receive()
+    if message["type"] != "websocket.connect":
+        return
+    if not user_id:
+        await send({"type": "websocket.close", "code": 4400})
+        return
+    await send({"type": "websocket.accept"})
+
+    # Messages that arrive while a turn is running are kept for the next turns
+    backlog: List[Dict[str, Any]] = []
+    while True:
+        message = backlog.pop(0) if backlog else await receive()
+        if message["type"] == "websocket.disconnect":
+            return
+        try:
+            text = message.get("text") or (message.get("bytes") or b"").decode("utf-8")
+            payload = json.loads(text)
+        except ValueError:
+            payload = None
+        if not isinstance(payload, dict) or not str(payload.get("message") or "").strip():
+            await send({"type": "websocket.send", "text": json.dumps({"type": "error", "error": "Send a JSON object with a message"})})
+            continue
+        events = run_turn(user_id, str(payload["message"]).strip(), payload.get("turn_id"))
+        disconnected = asyncio.ensure_future(_watch_disconnect(receive, backlog))
+        try:
+            while True:
+                try:
+                    event = await _next_event(events, disconnected)
+                except StopAsyncIteration:
+                    break
+                if event is _DISCONNECTED:
+                    logger.info(f"WebSocket for {user_id} closed, stopped the turn")
+                    return
+                await send({"type": "websocket.send", "text": json.dumps(event)})
+        except Overloaded as e:
+            await send({"type": "websocket.send", "text": json.dumps({"type": "error", "status": e.status, "error": e.reason})})
+            continue
+        finally:
+            disconnected.cancel()
+            await events.aclose()
+        if disconnected.done() and not disconnected.cancelled():
+            return
+        await send({"type": "websocket.send", "text": json.dumps({"type": "done"})})
+
+
+async def _warm_up() -> None:
+    """Build the agent and the calendar service before serving, when a token exists.
+
+    Without a token the OAuth flow would need a browser, so the first request
+    (after authenticating elsewhere) pays for initialization instead.
+    """
+    if os.getenv("SERVER_WARM_UP", "1").lower() not in ("1", "true", "yes"):
+        return
+    from app.auth_utils import is_logged_in
+
+    loop = asyncio.get_running_loop()
+    if not await loop.run_in_executor(_executor, is_logged_in):
+        logger.info("Skipping warm-up: no valid token.json")
+        return
+    try:
+        agent = await loop.run_in_executor(_executor, get_agent)
+        await loop.run_in_executor(_executor, agent.warm_up)
+    except Exception as e:
+        logger.error(f"Warm-up failed, initializing on first request instead: {str(e)}")
+
+
+async def _handle_lifespan(receive, send) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await _warm_up()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            _executor.shutdown(wait=False)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send) -> None:
+    """ASGI entry point."""
+    if scope["type"] == "lifespan":
+        await _handle_lifespan(receive, send)
+    elif scope["type"] == "websocket" and scope["path"] == "/v1/ws":
+        await _handle_websocket(scope, receive, send)
+    elif scope["type"] == "http" and scope["path"] == "/health":
+        await _send_json(send, 200, {"status": "ok", "queued": _get_admission().waiting})
+    elif scope["type"] == "http" and scope["path"] == "/v1/chat":
+        if scope["method"] != "POST":
+            await _send_json(send, 405, {"error": "Method not allowed"})
+            return
+        await _handle_chat(scope, receive, send)
+    elif scope["type"] == "http":
+        await _send_json(send, 404, {"error": "Not found"})
+    elif scope["type"] == "websocket":
+        await send({"type": "websocket.close", "code": 4404})
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(
+        "app.server:app",
+        host=os.getenv("SERVER_HOST", "127.0.0.1"),
+        port=int(os.getenv("SERVER_PORT", "8000")),
+        workers=int(os.getenv("SERVER_WORKERS", str(os.cpu_count() or 1))),
+    )
@@ -0,0 +1,169 @@
+# app/session_store.py
+import fcntl
+import hashlib
+import json
+import os
+from abc import ABC, abstractmethod
+import uuid
+from typing import Any, Dict, List, Optional
+
+from config.logger_config import setup_logger
+
+# Set up logger
+logger = setup_logger(__name__)
+
+# Only the most recent turns are replayed to the agent
+MAX_HISTORY_MESSAGES = 20
+
+# A turn slot held by a worker that died is freed after this long (Redis only;
+# file locks are released by the operating system)
+TURN_SLOT_TTL_SECONDS = 600
+
+
+class SessionStore(ABC):
+    """Conversation history kept outside the server process.
+
+    Any worker, on any core or node sharing the backend, can serve the next
+    turn of a user's conversation.
+    """
+
+    @abstractmethod
+    def get_history(self, user_id: str) -> List[Dict[str, str]]:
+        """Return the stored messages of a user, oldest first."""
+
+    @abstractmethod
+    def append(self, user_id: str, messages: List[Dict[str, str]]) -> None:
+        """Append messages to a user's history, keeping the last MAX_HISTORY_MESSAGES."""
+
+    @abstractmethod
+    def clear(self, user_id: str) -> None:
+        """Delete a user's history."""
+
+    @abstractmethod
+    def acquire_turn(self, user_id: str, limit: int) -> Optional[Any]:
+        """Take one of a user's ``limit`` turn slots, shared by every worker.
+
+        Returns:
+            A token to pass to release_turn, or None when all slots are taken.
+        """
+
+    @abstractmethod
+    def release_turn(self, user_id: str, token: Any) -> None:
+        """Give back a turn slot taken with acquire_turn."""
+
+
+class FileSessionStore(SessionStore):
+    """Session store backed by one JSON file per user, shared by workers on one host."""
+
+    def __init__(self, directory: str = "sessions"):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, user_id: str) -> str:
+        digest = hashlib.sha256(user_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def get_history(self, user_id: str) -> List[Dict[str, str]]:
+        path = self._path(user_id)
+        if not os.path.exists(path):
+            return []
+        with open(path, "r") as f:
+            fcntl.flock(f, fcntl.LOCK_SH)
+            try:
+                return json.load(f)
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def append(self, user_id: str, messages: List[Dict[str, str]]) -> None:
+        with open(self._path(user_id), "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                content = f.read()
+                history = json.loads(content) if content else []
+                history = (history + messages)[-MAX_HISTORY_MESSAGES:]
+                f.seek(0)
+                f.truncate()
+                json.dump(history, f)
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def clear(self, user_id: str) -> None:
+        path = self._path(user_id)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def acquire_turn(self, user_id: str, limit: int) -> Optional[Any]:
+        # One lock file per slot; the lock is dropped if the worker dies
+        base = self._path(user_id)[:-len(".json")]
+        for slot in range(limit):
+            f = open(f"{base}.turn{slot}.lock", "a")
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                f.close()
+                continue
+            return f
+        return None
+
+    def release_turn(self, user_id: str, token: Any) -> None:
+        fcntl.flock(token, fcntl.LOCK_UN)
+        token.close()
+
+
+class RedisSessionStore(SessionStore):
+    """Session store backed by Redis lists, shared by workers across nodes."""
+
+    def __init__(self, url: str, ttl_seconds: int = 24 * 3600):
+        # Imported here so the redis client is only needed when this store is used
+        import redis
+
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.ttl_seconds = ttl_seconds
+
+    def _key(self, user_id: str) -> str:
+        return f"calendar-agent:session:{user_id}"
+
+    def get_history(self, user_id: str) -> List[Dict[str, str]]:
+        return [json.loads(item) for item in self.client.lrange(self._key(user_id), 0, -1)]
+
+    def append(self, user_id: str, messages: List[Dict[str, str]]) -> None:
+        key = self._key(user_id)
+        pipe = self.client.pipeline()
+        pipe.rpush(key, *[json.dumps(m) for m in messages])
+        pipe.ltrim(key, -MAX_HISTORY_MESSAGES, -1)
+        pipe.expire(key, self.ttl_seconds)
+        pipe.execute()
+
+    def clear(self, user_id: str) -> None:
+        self.client.delete(self._key(user_id))
+
+    def acquire_turn(self, user_id: str, limit: int) -> Optional[Any]:
+        owner = uuid.uuid4().hex
+        for slot in range(limit):
+            key = f"{self._key(user_id)}:turn:{slot}"
+            if self.client.set(key, owner, nx=True, ex=TURN_SLOT_TTL_SECONDS):
+                return key, owner
+        return None
+
+    def release_turn(self, user_id: str, token: Any) -> None:
+        key, owner = token
+        # Only delete the slot if it still belongs to this turn (it may have expired)
+        self.client.eval(
+            "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0",
+            1, key, owner
+        )
+
+
+def get_session_store() -> SessionStore:
+    """Build the session store configured by the SESSION_STORE_URL environment variable.
+
+    'redis://...' selects Redis; anything else is used as a directory path
+    (default: 'sessions').
+    """
+    url = os.getenv("SESSION_STORE_URL", "sessions")
+    if url.startswith(("redis://", "rediss://")):
+        logger.info("Using Redis session store")
+        return RedisSessionStore(url)
+    logger.info(f"Using file session store in {url}")
+    return FileSessionStore(url)
@@ -0,0 +1,62 @@
+# app/tool_selection.py
+"""Cheap keyword pre-classifier picking the tools relevant to a turn.
+
+Kept free of LangChain imports so it can be used and tested on its own; the
+compact tool schemas it is meant for live in app.compact_tools.
+"""
+import re
+from typing import Any, Dict, List, Optional, Set
+
+# Keyword rules for the intent pre-classifier, keyed by tool name
+TOOL_INTENTS = {
+    "create_calendar_event": r"\b(schedule|create|add|book|set up|plan)\b|\bnew (meeting|event|appointment|call)\b",
+    "update_calendar_event": r"\b(move|reschedule|change|update|rename|shift|postpone|push|edit|invite)\b",
+    "delete_calendar_event": r"\b(cancel|delete|remove|drop)\b|\bclear (out|my|the|all|every|everything)\b",
+    # A quantifier alone ("are all free") is not enough; it must follow a change verb
+    "bulk_calendar_operation": (
+        r"\b(cancel|delete|remove|clear|drop|move|update|change|rename|mark"
+        r"|add|append|attach|put|set|tag|colou?r)\b.*\b(all|every|each)\b"
+    ),
+    "find_meeting_times": (
+        r"\b(free|busy|available|availability|slot|slots|find a time|when can)\b"
+        r"|\bclear\b(?! (out|my|the|all|every|everything)\b)"
+    ),
+    "analyze_calendar": r"\b(analy[sz]e|analytics|stats|statistics|busiest|how many|how much|load|per week|per day)\b",
+    "get_calendars_info": r"\bcalendars\b|\bwhich calendar\b",
+    "get_current_datetime": r"\btime ?zone\b",
+}
+
+# Always exposed, since most actions need to look events up first
+BASE_TOOLS = {"search_calendar_events"}
+
+
+def match_intents(text: str) -> Set[str]:
+    """Return the names of the tools whose keyword rule matches a text."""
+    text = text.lower()
+    return {name for name, pattern in TOOL_INTENTS.items() if re.search(pattern, text)}
+
+
+def select_tools(query: str, tools: List[Any], history: Optional[List[Dict[str, str]]] = None) -> List[Any]:
+    """Pick the tools relevant to a query with keyword rules.
+
+    The tools matched by the previous user message are kept, so a follow-up
+    such as "yes, delete them" after a bulk dry run still reaches the tool
+    the previous turn used. Falls back to every tool when no rule matches, so
+    an unusual phrasing costs a larger prompt rather than a missing tool.
+
+    Args:
+        query: The user's query string
+        tools: The tools to choose from
+        history: Previous turns as {"role": "user" | "assistant", "content": str}
+
+    Returns:
+        List: The selected tools, in their original order
+    """
+    names = match_intents(query)
+    previous = next((m["content"] for m in reversed(history or []) if m.get("role") == "user"), None)
+    if previous:
+        names |= match_intents(previous)
+    if not names:
+        return list(tools)
+    names |= BASE_TOOLS
+    return [t for t in tools if t.name in names]
@@ -0,0 +1,144 @@
+"""Compare EventTable with lists of Google event dicts on synthetic events.
+
+    python -m benchmarks.event_table_bench                 # 1M events
+    python -m benchmarks.event_table_bench --events 100000
+
+Reports retained memory of each representation and the time of three
+analytics queries: a range filter, busy hours per week, and meeting time per
+attendee.
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator
+
+import numpy as np
+
+from app.event_table import EventTableBuilder
+from app.scheduling import parse_rfc3339
+
+CALENDARS = [f"calendar-{i}@example.com" for i in range(5)]
+ATTENDEES = [f"person-{i}@example.com" for i in range(2000)]
+SUMMARIES = [f"Meeting topic {i}" for i in range(5000)]
+RANGE_START = datetime(2020, 1, 1, tzinfo=timezone.utc)
+RANGE_DAYS = 5 * 365
+
+
+def synthetic_events(count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """Yield events shaped like events.list items, spread over five years."""
+    rng = random.Random(seed)
+    for i in range(count):
+        start = RANGE_START + timedelta(minutes=15 * rng.randrange(RANGE_DAYS * 96))
+        end = start + timedelta(minutes=rng.choice([15, 30, 30, 45, 60, 60, 90, 120]))
+        yield {
+            "kind": "calendar#event",
+            "id": f"event{i:08d}",
+            "status": "confirmed",
+            "summary": rng.choice(SUMMARIES),
+            "calendarId": rng.choice(CALENDARS),
+            "start": {"dateTime": start.isoformat(), "timeZone": "UTC"},
+            "end": {"dateTime": end.isoformat(), "timeZone": "UTC"},
+            "attendees": [{"email": email, "responseStatus": "accepted"} for email in rng.sample(ATTENDEES, rng.randint(1, 5))],
+        }
+
+
+def measure(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    return label, time.perf_counter() - start, result
+
+
+def retained(build):
+    """Build an object and return it with the memory it retains, in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, size
+
+
+def build_table(count: int):
+    builder = EventTableBuilder()
+    for event in synthetic_events(count):
+        builder.add_event(event["calendarId"], event)
+    return builder.build()
+
+
+def dict_range_count(events, lo, hi) -> int:
+    return sum(
+        1 for e in events
+        if parse_rfc3339(e["start"]["dateTime"]) < hi and parse_rfc3339(e["end"]["dateTime"]) > lo
+    )
+
+
+def dict_busy_per_week(events) -> Dict[int, float]:
+    busy = defaultdict(float)
+    for e in events:
+        start = parse_rfc3339(e["start"]["dateTime"])
+        end = parse_rfc3339(e["end"]["dateTime"])
+        year, week, _ = start.isocalendar()
+        busy[(year, week)] += (end - start).total_seconds()
+    return busy
+
+
+def dict_time_per_attendee(events) -> Dict[str, float]:
+    busy = defaultdict(float)
+    for e in events:
+        seconds = (parse_rfc3339(e["end"]["dateTime"]) - parse_rfc3339(e["start"]["dateTime"])).total_seconds()
+        for attendee in e.get("attendees", []):
+            busy[attendee["email"]] += seconds
+    return busy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    lo = RANGE_START + timedelta(days=365)
+    hi = lo + timedelta(days=90)
+
+    build_start = time.perf_counter()
+    events, dict_bytes = retained(lambda: list(synthetic_events(args.events)))
+    dict_build = time.perf_counter() - build_start
+    build_start = time.perf_counter()
+    table, table_bytes = retained(lambda: build_table(args.events))
+    table_build = time.perf_counter() - build_start
+
+    print(f"{args.events} events")
+    print(f"{'':<26}{'dicts':>12}{'EventTable':>12}{'speedup':>10}")
+    print(f"{'memory (MB)':<26}{dict_bytes / 1e6:>12.1f}{table_bytes / 1e6:>12.1f}{dict_bytes / table_bytes:>9.1f}x")
+    print(f"{'build (s)':<26}{dict_build:>12.2f}{table_build:>12.2f}")
+
+    lo_ts, hi_ts = int(lo.timestamp()), int(hi.timestamp())
+    queries = [
+        ("range filter (s)",
+         lambda: dict_range_count(events, lo, hi),
+         lambda: int(table.overlapping(lo_ts, hi_ts).sum())),
+        ("busy hours per week (s)",
+         lambda: dict_busy_per_week(events),
+         lambda: table.group_by_week("UTC")),
+        ("time per attendee (s)",
+         lambda: dict_time_per_attendee(events),
+         lambda: table.group_by_attendee()),
+    ]
+    for label, dict_query, table_query in queries:
+        _, dict_time, dict_result = measure(label, dict_query)
+        _, table_time, table_result = measure(label, table_query)
+        print(f"{label:<26}{dict_time:>12.3f}{table_time:>12.3f}{dict_time / table_time:>9.0f}x")
+        if label.startswith("range"):
+            assert dict_result == table_result, (dict_result, table_result)
+        elif label.startswith("time per attendee"):
+            seconds = table_result[1]
+            for email, total in dict_result.items():
+                assert np.isclose(seconds[table.attendee_pool.code(email)], total)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Startup profile: import time of the entry-point modules against a budget.
+
+    python -m benchmarks.import_time            # report and check the budget
+    python -m benchmarks.import_time --top 15   # show more of the slowest imports
+    python -m benchmarks.import_time --agent    # also time CalendarAgent() and warm_up()
+
+Each module is imported in a fresh interpreter with ``-X importtime``. The
+report lists the cumulative import time per module and the slowest imports
+underneath it. Imports run in an empty temporary directory, and a module that
+creates files or directories there (logs, sessions) fails the check. The exit
+code is 1 when a module exceeds its budget, touches the disk or loads one of
+DEFERRED_PACKAGES, so heavy or side-effecting imports that creep back to module
+level are caught. Modules whose third-party dependencies are not installed are
+reported as skipped.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time budget per module, in milliseconds. The entry points
+# should not load LangChain, the LLM provider or the Google client libraries,
+# which take well over a second together. The tool modules need langchain_core
+# for the @tool decorator, but nothing more.
+IMPORT_BUDGET_MS = {
+    "config.logger_config": 50,
+    "app": 30,
+    "app.app": 80,
+    "app.scheduling": 60,
+    "app.tool_selection": 40,
+    "app.server": 150,
+    "app.calendar_tools": 600,
+    "app.compact_tools": 700,
+}
+
+# Packages that must only be imported on first use: the Google API client and
+# OAuth flow (authentication at import time), and the agent and LLM stack
+DEFERRED_PACKAGES = [
+    "googleapiclient",
+    "google_auth_oauthlib",
+    "langchain_google_community",
+    "langchain",
+    "langchain_openai",
+    "langgraph",
+]
+
+
+def profile_import(module: str) -> Tuple[List[Tuple[int, int, str]], List[str]]:
+    """Import a module in a fresh interpreter and parse its ``-X importtime`` output.
+
+    The interpreter runs in an empty temporary directory with the repository
+    on PYTHONPATH, so anything the import writes relative to the working
+    directory shows up there.
+
+    Returns:
+        Tuple: (rows, created) where rows holds (self_us, cumulative_us, name)
+        per imported module in the order reported, with nesting kept as leading
+        spaces in name, and created lists the paths the import left behind.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+    with tempfile.TemporaryDirectory() as workdir:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=workdir,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        created = sorted(os.listdir(workdir))
+    if result.returncode != 0:
+        if "ModuleNotFoundError" in result.stderr:
+            raise ModuleNotFoundError(result.stderr.strip().splitlines()[-1])
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()[1:]))
+    return rows, created
+
+
+def import_subtree(rows: List[Tuple[int, int, str]], module: str) -> Tuple[int, List[Tuple[int, int, str]]]:
+    """Return the cumulative time of a module and the imports nested under it."""
+    end = next(i for i in range(len(rows) - 1, -1, -1) if rows[i][2] == module)
+    start = end
+    while start > 0 and rows[start - 1][2].startswith(" "):
+        start -= 1
+    return rows[end][1], rows[start:end]
+
+
+def deferred_imports(rows: List[Tuple[int, int, str]]) -> List[str]:
+    """Return the DEFERRED_PACKAGES (top-level packages) found among the imported modules."""
+    loaded = {name.strip().split(".")[0] for _, _, name in rows}
+    return [package for package in DEFERRED_PACKAGES if package in loaded]
+
+
+def time_agent_startup() -> None:
+    """Time CalendarAgent construction and warm-up, the first-request costs."""
+    sys.path.insert(0, ROOT)
+    from app.app import CalendarAgent
+
+    start = time.perf_counter()
+    agent = CalendarAgent()
+    created = time.perf_counter()
+    agent.warm_up()
+    warmed = time.perf_counter()
+    print(f"CalendarAgent(): {(created - start) * 1000:.0f}ms, warm_up(): {(warmed - created) * 1000:.0f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=5, help="Slowest imports to list per module")
+    parser.add_argument("--agent", action="store_true", help="Also time agent creation and warm-up")
+    args = parser.parse_args()
+
+    over_budget = []
+    touched_disk = []
+    eager = []
+    for module, budget_ms in IMPORT_BUDGET_MS.items():
+        try:
+            rows, created = profile_import(module)
+        except ModuleNotFoundError as e:
+            print(f"{module:<24}  skipped: {e}")
+            continue
+        total_us, children = import_subtree(rows, module)
+        total_ms = total_us / 1000
+        status = "ok" if total_ms <= budget_ms else "OVER BUDGET"
+        print(f"{module:<24}{total_ms:>8.1f}ms  (budget {budget_ms}ms)  {status}")
+        for self_us, cumulative_us, name in sorted(children, key=lambda r: r[1], reverse=True)[:args.top]:
+            print(f"    {cumulative_us / 1000:>8.1f}ms  {name.strip()}")
+        if created:
+            print(f"    created on import: {', '.join(created)}")
+            touched_disk.append(module)
+        loaded = deferred_imports(rows)
+        if loaded:
+            print(f"    loaded on import: {', '.join(loaded)}")
+            eager.append(module)
+        if total_ms > budget_ms:
+            over_budget.append(module)
+
+    if args.agent:
+        time_agent_startup()
+
+    if over_budget:
+        print(f"Over budget: {', '.join(over_budget)}")
+    if touched_disk:
+        print(f"Created files on import: {', '.join(touched_disk)}")
+    if eager:
+        print(f"Loaded deferred packages on import: {', '.join(eager)}")
+    if over_budget or touched_disk or eager:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Local load test for the API server (app/server.py).
+
+Start the server, then run for example:
+
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --requests 200 --concurrency 20 --users 10
+
+Reports throughput, status codes, and p50/p95/p99 latency for the full
+response and for the first streamed event.
+"""
+import argparse
+import http.client
+import json
+import math
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def send_request(url: str, user_id: str, message: str, timeout: float) -> Dict[str, Optional[float]]:
+    """POST one chat message and time the first event and the full streamed response."""
+    parsed = urlparse(url)
+    conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=timeout)
+    start = time.perf_counter()
+    first_event = None
+    try:
+        conn.request(
+            "POST", "/v1/chat",
+            body=json.dumps({"user_id": user_id, "message": message}),
+            headers={"Content-Type": "application/json"},
+        )
+        response = conn.getresponse()
+        if response.status == 200:
+            for line in response:
+                if first_event is None and line.strip():
+                    first_event = time.perf_counter() - start
+        else:
+            response.read()
+        return {"status": response.status, "latency": time.perf_counter() - start, "first_event": first_event}
+    except Exception:
+        return {"status": "error", "latency": time.perf_counter() - start, "first_event": None}
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--requests", type=int, default=100, help="Total number of requests")
+    parser.add_argument("--concurrency", type=int, default=10, help="Requests in flight at once")
+    parser.add_argument("--users", type=int, default=10, help="Number of distinct user ids")
+    parser.add_argument("--message", default="What's on my calendar today?")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    def worker(i):
+        return send_request(args.url, f"load-test-user-{i % args.users}", args.message, args.timeout)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(worker, range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    statuses = Counter(r["status"] for r in results)
+    ok = [r for r in results if r["status"] == 200]
+    latencies = [r["latency"] for r in ok]
+    first_events = [r["first_event"] for r in ok if r["first_event"] is not None]
+
+    print(f"Requests:    {args.requests} ({args.concurrency} concurrent, {args.users} users)")
+    print(f"Elapsed:     {elapsed:.2f}s")
+    print(f"Throughput:  {len(ok) / elapsed:.2f} successful req/s")
+    print(f"Statuses:    {dict(statuses)}")
+    for label, values in (("Latency", latencies), ("First event", first_events)):
+        print(
+            f"{label + ':':<13}p50={percentile(values, 50) * 1000:.0f}ms "
+            f"p95={percentile(values, 95) * 1000:.0f}ms "
+            f"p99={percentile(values, 99) * 1000:.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Compare the prompt footprint of the full and compact tool schemas.
+
+    python -m benchmarks.prompt_footprint
+
+Prints the estimated schema tokens sent on every model call for the full tool
+set, the compact tool set, and the compact subset picked per sample query.
+Actual per-call token usage is logged by CalendarAgent when
+CALENDAR_AGENT_MEASURE_TOKENS=1.
+"""
+from app.calendar_tools import (
+    analyze_calendar,
+    bulk_calendar_operation,
+    create_calendar_event,
+    delete_calendar_event,
+    find_meeting_times,
+    get_calendars_info,
+    get_current_datetime,
+    search_calendar_events,
+    update_calendar_event,
+)
+from app.compact_tools import COMPACT_TOOLS, estimate_tool_schema_tokens, select_tools
+
+FULL_TOOLS = [
+    search_calendar_events,
+    create_calendar_event,
+    update_calendar_event,
+    delete_calendar_event,
+    get_calendars_info,
+    get_current_datetime,
+    bulk_calendar_operation,
+    find_meeting_times,
+    analyze_calendar,
+]
+
+SAMPLE_QUERIES = [
+    "What's on my calendar today?",
+    "Schedule a meeting tomorrow at 2pm about project update",
+    "Move my 2pm meeting to 3pm",
+    "Cancel all my 1:1s next week",
+    "Find an hour next week when Alice, Bob and I are all free",
+    "How many hours of meetings did I have per week this quarter?",
+]
+
+
+def main():
+    full = estimate_tool_schema_tokens(FULL_TOOLS)
+    compact = estimate_tool_schema_tokens(COMPACT_TOOLS)
+    print(f"{'Tool set':<60}{'tools':>6}{'~tokens':>10}")
+    print(f"{'full':<60}{len(FULL_TOOLS):>6}{full:>10}")
+    print(f"{'compact':<60}{len(COMPACT_TOOLS):>6}{compact:>10}")
+    for query in SAMPLE_QUERIES:
+        tools = select_tools(query, COMPACT_TOOLS)
+        print(f"{'compact: ' + query:<60}{len(tools):>6}{estimate_tool_schema_tokens(tools):>10}")
+
+
+if __name__ == "__main__":
+    main()
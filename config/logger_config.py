@@ -2,8 +2,20 @@ import logging
 import os
 from datetime import datetime
 
-# Create logs directory if it doesn't exist
-os.makedirs('logs', exist_ok=True)
+
+class LazyFileHandler(logging.FileHandler):
+    """FileHandler that creates its directory and file on the first log record.
+
+    Importing a module that sets up a logger therefore leaves nothing on disk.
+    """
+
+    def __init__(self, filename, mode='a', encoding=None):
+        super().__init__(filename, mode=mode, encoding=encoding, delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
 
 # Configure logging
 def setup_logger(name):
@@ -28,9 +40,9 @@ def setup_logger(name):
             '%(levelname)s - %(message)s'
         )
         
-        # File handler
+        # File handler; the logs directory and file are created by the first record
         log_file = os.path.join('logs', f'calendar_bot_{datetime.now().strftime("%Y%m%d")}.log')
-        file_handler = logging.FileHandler(log_file)
+        file_handler = LazyFileHandler(log_file)
         file_handler.setLevel(logging.INFO)
         file_handler.setFormatter(file_formatter)
         
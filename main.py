@@ -1,6 +1,7 @@
 # app/main.py
 import streamlit as st
 import os
+import uuid
 from datetime import datetime
 from app.auth_utils import is_logged_in, get_credentials, logout
 from app.app import CalendarAgent
@@ -54,12 +55,15 @@ if 'agent' not in st.session_state:
     st.session_state.agent = None
 if 'logged_in' not in st.session_state:
     st.session_state.logged_in = is_logged_in()
+if 'pending_turn' not in st.session_state:
+    # Message still being answered and its turn id, kept until the turn completes
+    st.session_state.pending_turn = None
 
 def initialize_agent():
     """Initialize the calendar agent if not already done"""
     if st.session_state.agent is None:
         with st.spinner("Initializing AI assistant..."):
-            st.session_state.agent = CalendarAgent()
+            st.session_state.agent = CalendarAgent().warm_up()
 
 def handle_logout():
     """Handle user logout"""
@@ -67,6 +71,7 @@ def handle_logout():
         st.session_state.logged_in = False
         st.session_state.agent = None
         st.session_state.messages = []
+        st.session_state.pending_turn = None
 
 def handle_login():
     """Handle user login"""
@@ -87,17 +92,29 @@ def handle_submit():
     """Handle message submission"""
     user_input = st.session_state.user_input.strip()
     if user_input:
+        # Earlier turns give the agent context and let follow-ups keep their tools
+        history = [{"role": m["role"], "content": m["content"]} for m in st.session_state.messages]
+        
         # Add user message
         add_message("user", user_input)
         
         # Clear input immediately
         st.session_state.user_input = ""
         
+        # Reuse the turn id when the same message is resubmitted after an
+        # interrupted or failed run, so events it already created are not duplicated
+        pending = st.session_state.pending_turn
+        if pending is None or pending["input"] != user_input:
+            pending = {"input": user_input, "turn_id": uuid.uuid4().hex}
+            st.session_state.pending_turn = pending
+        
         # Get AI response
         try:
-            response = st.session_state.agent.process_message(user_input)
+            response = st.session_state.agent.process_message(user_input, history, turn_id=pending["turn_id"])
+            st.session_state.pending_turn = None
             add_message("assistant", response)
         except Exception as e:
+            # pending_turn is kept, so resubmitting this message reuses its turn id
             add_message("assistant", f"Sorry, I encountered an error: {str(e)}")
 
 # Main app
@@ -12,6 +12,7 @@ setup(
         "streamlit>=1.30.0",
         "google-auth-oauthlib",
         "python-dotenv",
+        "numpy",
     ],
     python_requires=">=3.8",
 )
\ No newline at end of file
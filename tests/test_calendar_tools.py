@@ -0,0 +1,263 @@
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from app import calendar_tools  # noqa: E402
+from app.calendar_tools import (  # noqa: E402
+    _build_event_body,
+    _build_patch_body,
+    _has_attendee,
+    _idempotency_key,
+    _invalidate_freebusy_cache,
+    _query_freebusy,
+)
+
+ARGUMENTS = {
+    "summary": "Project sync",
+    "start_datetime": "2025-01-06 10:00:00",
+    "end_datetime": "2025-01-06 11:00:00",
+    "timezone": "America/New_York",
+    "attendees": ["Bob@example.com", "alice@example.com"],
+    "description": None,
+}
+
+
+def test_idempotency_key_is_a_valid_event_id():
+    key = _idempotency_key("turn-1", ARGUMENTS)
+    assert len(key) == 32
+    assert set(key) <= set("0123456789abcdefghijklmnopqrstuv")
+
+
+def test_idempotency_key_ignores_formatting_differences():
+    reformatted = dict(
+        ARGUMENTS,
+        summary="  Project sync ",
+        attendees=["ALICE@example.com", "bob@example.com"],
+    )
+    del reformatted["description"]
+    assert _idempotency_key("turn-1", reformatted) == _idempotency_key("turn-1", ARGUMENTS)
+
+
+def test_idempotency_key_changes_with_turn_and_arguments():
+    key = _idempotency_key("turn-1", ARGUMENTS)
+    assert _idempotency_key("turn-2", ARGUMENTS) != key
+    assert _idempotency_key("turn-1", dict(ARGUMENTS, start_datetime="2025-01-06 10:30:00")) != key
+
+
+def test_build_event_body_uses_event_timezone_offset():
+    body = _build_event_body(**ARGUMENTS)
+    assert body["start"] == {"dateTime": "2025-01-06T10:00:00-05:00", "timeZone": "America/New_York"}
+    assert body["attendees"] == [{"email": "Bob@example.com"}, {"email": "alice@example.com"}]
+    assert "description" not in body
+
+
+def test_build_event_body_all_day_recurrence_and_reminders():
+    body = _build_event_body(
+        "Offsite", "2025-01-06", "2025-01-07",
+        recurrence={"FREQ": "WEEKLY", "COUNT": 3, "UNTIL": None},
+        reminders=[{"method": "popup", "minutes": 10}],
+        conference_data=True,
+    )
+    assert body["start"] == {"date": "2025-01-06"}
+    assert body["recurrence"] == ["RRULE:FREQ=WEEKLY;COUNT=3"]
+    assert body["reminders"] == {"useDefault": False, "overrides": [{"method": "popup", "minutes": 10}]}
+    assert body["conferenceData"]["createRequest"]["conferenceSolutionKey"] == {"type": "hangoutsMeet"}
+
+
+@pytest.mark.parametrize("overrides", [
+    {"start_datetime": "2025-01-06 10:00"},
+    {"attendees": ["not-an-email"]},
+    {"reminders": [{"method": "sms", "minutes": 5}]},
+])
+def test_build_event_body_rejects_invalid_arguments(overrides):
+    with pytest.raises(ValueError):
+        _build_event_body(**dict(ARGUMENTS, **overrides))
+
+
+class FakeRequest:
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self):
+        return self.result
+
+
+class FakeFreeBusy:
+    def __init__(self):
+        self.queries = 0
+
+    def query(self, body):
+        self.queries += 1
+        busy = [{"start": "2025-01-06T10:00:00Z", "end": "2025-01-06T11:00:00Z"}]
+        return FakeRequest({"calendars": {item["id"]: {"busy": busy} for item in body["items"]}})
+
+
+class FakeFreeBusyService:
+    def __init__(self):
+        self.free_busy = FakeFreeBusy()
+
+    def freebusy(self):
+        return self.free_busy
+
+
+@pytest.fixture
+def freebusy_service(monkeypatch):
+    service = FakeFreeBusyService()
+    monkeypatch.setattr(calendar_tools, "get_api_resource", lambda: service)
+    _invalidate_freebusy_cache()
+    yield service
+    _invalidate_freebusy_cache()
+
+
+def test_freebusy_cache_is_dropped_after_a_write(freebusy_service):
+    start = datetime(2025, 1, 6, 9, tzinfo=timezone.utc)
+    end = datetime(2025, 1, 6, 17, tzinfo=timezone.utc)
+    _query_freebusy(["primary"], start, end)
+    _query_freebusy(["primary"], start, end)
+    assert freebusy_service.free_busy.queries == 1
+
+    _invalidate_freebusy_cache()
+    result = _query_freebusy(["primary"], start, end)
+    assert freebusy_service.free_busy.queries == 2
+    assert len(result["primary"]["busy"]) == 1
+
+
+def test_build_patch_body_maps_fields_and_appends_description():
+    updates = {"summary": "Sync", "color_id": "5", "append_description": "https://zoom.us/j/1"}
+    assert _build_patch_body({"description": "Agenda"}, updates) == {
+        "summary": "Sync",
+        "colorId": "5",
+        "description": "Agenda\n\nhttps://zoom.us/j/1",
+    }
+    assert _build_patch_body({}, {"append_description": "link"}) == {"description": "link"}
+
+
+def test_has_attendee_matches_email_name_and_organizer():
+    event = {
+        "attendees": [{"email": "alice@example.com", "displayName": "Alice Smith"}],
+        "organizer": {"email": "bob@example.com"},
+    }
+    assert _has_attendee(event, "ALICE@example.com")
+    assert _has_attendee(event, "smith")
+    assert _has_attendee(event, "bob@")
+    assert not _has_attendee(event, "carol")
+
+
+class FakeHttpError(Exception):
+    def __init__(self, status, reason):
+        super().__init__(f"{status} {reason}")
+        self.resp = SimpleNamespace(status=status)
+        self.content = json.dumps({"error": {"errors": [{"reason": reason}]}}).encode("utf-8")
+
+
+class FakeBatch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.items = []
+
+    def add(self, request, request_id):
+        self.items.append((request_id, request))
+
+    def execute(self):
+        self.service.batches.append([key for key, _ in self.items])
+        for key, request in self.items:
+            self.callback(key, {}, self.service.outcome(key))
+
+
+class FakeBulkService:
+    """Calendar service with one calendar, paginated events and scripted batch outcomes."""
+
+    def __init__(self, count, page_size=100, errors=None):
+        self.events_data = [
+            {"id": f"e{i}", "summary": f"1:1 #{i}", "start": {"dateTime": "2025-01-06T10:00:00Z"}}
+            for i in range(count)
+        ]
+        self.page_size = page_size
+        self.errors = errors or {}
+        self.batches = []
+        self.attempts = {}
+
+    def calendarList(self):
+        return SimpleNamespace(list=lambda: FakeRequest({"items": [{"id": "me@example.com", "primary": True, "timeZone": "UTC"}]}))
+
+    def events(self):
+        return SimpleNamespace(list=self._list, delete=lambda **kwargs: ("delete", kwargs), patch=lambda **kwargs: ("patch", kwargs))
+
+    def _list(self, pageToken=None, **kwargs):
+        start = int(pageToken or 0)
+        page = {"items": self.events_data[start:start + self.page_size]}
+        if start + self.page_size < len(self.events_data):
+            page["nextPageToken"] = str(start + self.page_size)
+        return FakeRequest(page)
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+    def outcome(self, key):
+        self.attempts[key] = self.attempts.get(key, 0) + 1
+        errors = self.errors.get(key, [])
+        return errors[self.attempts[key] - 1] if self.attempts[key] <= len(errors) else None
+
+
+@pytest.fixture
+def bulk(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(calendar_tools.time, "sleep", sleeps.append)
+
+    def run(service, **arguments):
+        monkeypatch.setattr(calendar_tools, "get_api_resource", lambda: service)
+        tool = calendar_tools.bulk_calendar_operation
+        arguments = dict({"min_datetime": "2025-01-06 00:00:00", "max_datetime": "2025-01-13 00:00:00"}, **arguments)
+        return getattr(tool, "func", tool)(**arguments)
+
+    run.sleeps = sleeps
+    return run
+
+
+@pytest.mark.parametrize("arguments", [
+    {"action": "archive"},
+    {"action": "update"},
+    {"action": "update", "updates": {"title": "x"}},
+    {"action": "update", "updates": {"summary": "", "location": None}},
+])
+def test_bulk_rejects_invalid_actions_and_updates(bulk, arguments):
+    with pytest.raises(ValueError):
+        bulk(FakeBulkService(1), **arguments)
+
+
+def test_bulk_dry_run_truncates_at_max_events(bulk):
+    service = FakeBulkService(250)
+    result = bulk(service, action="delete", max_events=120)
+    assert result["matched"] == 120
+    assert result["truncated"] is True
+    assert len(result["events"]) == calendar_tools.BULK_PREVIEW_LIMIT
+    assert service.batches == []
+
+
+def test_bulk_splits_requests_into_batches(bulk):
+    service = FakeBulkService(120)
+    result = bulk(service, action="update", updates={"location": "Room 1"}, dry_run=False)
+    assert [len(batch) for batch in service.batches] == [50, 50, 20]
+    assert result["succeeded"] == 120 and result["failed"] == []
+    assert bulk.sleeps == [calendar_tools.BULK_BATCH_INTERVAL] * 2
+
+
+def test_bulk_retries_rate_limited_items_with_backoff(bulk):
+    rate_limited = FakeHttpError(403, "rateLimitExceeded")
+    service = FakeBulkService(3, errors={
+        "primary:e0": [FakeHttpError(429, "rateLimitExceeded"), rate_limited],
+        "primary:e1": [FakeHttpError(403, "forbidden")],
+        "primary:e2": [rate_limited] * (calendar_tools.BULK_MAX_RETRIES + 1),
+    })
+    result = bulk(service, action="delete", dry_run=False)
+    assert result["succeeded"] == 1
+    assert sorted(f["id"] for f in result["failed"]) == ["primary:e1", "primary:e2"]
+    assert service.attempts == {"primary:e0": 3, "primary:e1": 1, "primary:e2": calendar_tools.BULK_MAX_RETRIES + 1}
+    backoff = bulk.sleeps
+    assert len(backoff) == calendar_tools.BULK_MAX_RETRIES
+    assert all(later > earlier for earlier, later in zip(backoff, backoff[1:]))
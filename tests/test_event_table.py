@@ -0,0 +1,138 @@
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pytest
+
+from app.event_table import EventTableBuilder
+
+
+def timed(start, minutes=60, attendees=(), **extra):
+    end = start + timedelta(minutes=minutes)
+    return dict(
+        start={"dateTime": start.isoformat()},
+        end={"dateTime": end.isoformat()},
+        attendees=[{"email": email} for email in attendees],
+        **extra
+    )
+
+
+def build(events, calendar_id="primary", tz_name=None):
+    builder = EventTableBuilder()
+    builder.add_page(calendar_id, events, tz_name)
+    return builder.build()
+
+
+def reference_local_seconds(starts, tz_name):
+    tz = ZoneInfo(tz_name)
+    return np.array([
+        int(datetime.fromtimestamp(int(s), tz).replace(tzinfo=timezone.utc).timestamp()) for s in starts
+    ])
+
+
+@pytest.mark.parametrize("tz_name", ["America/New_York", "Australia/Lord_Howe", "Asia/Kolkata", "UTC"])
+def test_local_seconds_matches_per_event_conversion(tz_name):
+    first = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    table = build([timed(first + timedelta(minutes=15 * k), minutes=15) for k in range(366 * 96)])
+    np.testing.assert_array_equal(table.local_seconds(tz_name), reference_local_seconds(table.start, tz_name))
+
+
+def test_local_seconds_on_lord_howe_half_hour_shift():
+    # DST starts at 02:00 local on 2024-10-06 (+10:30 -> +11:00), i.e. 15:30 UTC on the 5th
+    table = build([
+        timed(datetime(2024, 10, 5, 15, 15, tzinfo=timezone.utc)),
+        timed(datetime(2024, 10, 5, 15, 45, tzinfo=timezone.utc)),
+    ])
+    local = table.local_seconds("Australia/Lord_Howe")
+    labels = [datetime.fromtimestamp(int(s), timezone.utc).strftime("%H:%M") for s in local]
+    assert labels == ["01:45", "02:45"]
+
+
+def test_all_day_and_transparent_events_are_flagged_and_not_busy():
+    start = datetime(2025, 1, 6, 9, tzinfo=timezone.utc)
+    table = build([
+        {"start": {"date": "2025-01-06"}, "end": {"date": "2025-01-07"}},
+        timed(start, transparency="transparent"),
+        timed(start),
+        timed(start, status="cancelled"),
+    ], tz_name="UTC")
+    assert len(table) == 3
+    assert table.all_day.tolist() == [True, False, False]
+    assert table.transparent.tolist() == [False, True, False]
+    busy = table.take(table.busy)
+    assert len(busy) == 1
+    assert int(busy.duration.sum()) == 3600
+
+
+def test_take_keeps_attendees_aligned():
+    start = datetime(2025, 1, 6, 9, tzinfo=timezone.utc)
+    table = build([
+        timed(start, attendees=["a@example.com", "b@example.com"]),
+        timed(start, attendees=["c@example.com"]),
+        timed(start, attendees=["B@example.com", "d@example.com", "e@example.com"]),
+    ])
+    subset = table.take(np.array([True, False, True]))
+    assert subset.attendee_offsets.tolist() == [0, 2, 5]
+    names = [subset.attendee_pool.values[code] for code in subset.attendees]
+    assert names == ["a@example.com", "b@example.com", "b@example.com", "d@example.com", "e@example.com"]
+    assert subset.all_day.tolist() == [False, False]
+
+
+def test_group_by_hour_weekday_and_week_use_local_time():
+    # 2025-01-05 23:30 UTC is Monday 2025-01-06 08:30 in Tokyo
+    table = build([
+        timed(datetime(2025, 1, 5, 23, 30, tzinfo=timezone.utc), minutes=30),
+        timed(datetime(2025, 1, 6, 1, 0, tzinfo=timezone.utc), minutes=90),
+    ])
+    counts, busy = table.group_by_hour_of_day("Asia/Tokyo")
+    assert counts[8] == 1 and counts[10] == 1 and counts.sum() == 2
+    assert busy[10] == 90 * 60
+
+    counts, busy = table.group_by_weekday("Asia/Tokyo")
+    assert counts.tolist() == [2, 0, 0, 0, 0, 0, 0]
+    assert busy[0] == 120 * 60
+
+    week_starts, counts, busy = table.group_by_week("Asia/Tokyo")
+    assert [datetime.fromtimestamp(int(s), timezone.utc).date().isoformat() for s in week_starts] == ["2025-01-06"]
+    assert counts.tolist() == [2]
+    # In UTC the first event falls on Sunday, in the previous week
+    assert table.group_by_week("UTC")[1].tolist() == [1, 1]
+
+
+def test_group_by_attendee_and_calendar():
+    start = datetime(2025, 1, 6, 9, tzinfo=timezone.utc)
+    builder = EventTableBuilder()
+    builder.add_event("work", timed(start, minutes=30, attendees=["a@example.com", "b@example.com"]))
+    builder.add_event("work", timed(start, minutes=60, attendees=["a@example.com"]))
+    builder.add_event("team", timed(start, minutes=15))
+    table = builder.build()
+
+    counts, seconds = table.group_by_attendee()
+    code = table.attendee_pool.code
+    assert counts[code("a@example.com")] == 2 and seconds[code("a@example.com")] == 90 * 60
+    assert counts[code("b@example.com")] == 1 and seconds[code("b@example.com")] == 30 * 60
+
+    counts, seconds = table.group_by_calendar()
+    assert counts[table.calendar_pool.code("work")] == 2
+    assert seconds[table.calendar_pool.code("team")] == 15 * 60
+
+
+def test_overlap_counts_and_filter_range():
+    base = datetime(2025, 1, 6, tzinfo=timezone.utc)
+    table = build([timed(base + timedelta(hours=h), minutes=90) for h in (9, 10, 14)])
+    edges = np.array([int((base + timedelta(hours=h)).timestamp()) for h in (8, 10, 12, 16)])
+    assert table.overlap_counts(edges).tolist() == [1, 2, 1]
+    assert len(table.filter_range(int(edges[1]), int(edges[2]))) == 2
+
+
+def test_declined_events_and_self_attendee_are_left_out():
+    start = datetime(2025, 1, 6, 9, tzinfo=timezone.utc)
+    me = {"email": "me@example.com", "self": True, "responseStatus": "accepted"}
+    table = build([
+        dict(timed(start), attendees=[me, {"email": "a@example.com"}]),
+        dict(timed(start), attendees=[dict(me, responseStatus="declined"), {"email": "b@example.com"}]),
+        dict(timed(start), attendees=[dict(me, responseStatus="tentative")]),
+    ])
+    assert len(table) == 2
+    assert table.attendee_pool.values == ["a@example.com"]
+    assert table.attendee_offsets.tolist() == [0, 1, 1]
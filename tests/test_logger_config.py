@@ -0,0 +1,28 @@
+import logging
+
+from config.logger_config import LazyFileHandler, setup_logger
+
+
+def test_lazy_file_handler_creates_directory_and_file_on_first_record(tmp_path):
+    path = tmp_path / "nested" / "app.log"
+    handler = LazyFileHandler(str(path))
+    try:
+        assert not (tmp_path / "nested").exists()
+        handler.emit(logging.makeLogRecord({"msg": "hello", "levelno": logging.INFO}))
+        assert path.read_text().strip() == "hello"
+    finally:
+        handler.close()
+
+
+def test_setup_logger_writes_nothing_until_a_record_is_logged(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    logger = setup_logger("tests.lazy_logger")
+    try:
+        assert list(tmp_path.iterdir()) == []
+        logger.info("first record")
+        [log_file] = (tmp_path / "logs").iterdir()
+        assert "first record" in log_file.read_text()
+    finally:
+        for handler in list(logger.handlers):
+            handler.close()
+            logger.removeHandler(handler)
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta, timezone
+
+from app.scheduling import (
+    find_candidate_slots,
+    intersect_intervals,
+    merge_busy_intervals,
+    parse_rfc3339,
+    subtract_intervals,
+    working_windows,
+)
+
+
+def at(hour, minute=0, day=6):
+    """An aware UTC datetime on 2025-01-<day> (the 6th is a Monday)."""
+    return datetime(2025, 1, day, hour, minute, tzinfo=timezone.utc)
+
+
+def test_parse_rfc3339_accepts_z_suffix():
+    assert parse_rfc3339("2025-01-06T09:00:00Z") == at(9)
+
+
+def test_merge_busy_intervals_merges_overlapping_and_touching():
+    merged = merge_busy_intervals([(at(13), at(14)), (at(9), at(10)), (at(9, 30), at(11)), (at(11), at(12))])
+    assert merged == [(at(9), at(12)), (at(13), at(14))]
+
+
+def test_merge_busy_intervals_keeps_nested_intervals_in_outer():
+    assert merge_busy_intervals([(at(9), at(17)), (at(10), at(11))]) == [(at(9), at(17))]
+    assert merge_busy_intervals([]) == []
+
+
+def test_intersect_intervals():
+    first = [(at(9), at(12)), (at(13), at(17))]
+    second = [(at(11), at(14)), (at(16), at(18))]
+    assert intersect_intervals(first, second) == [(at(11), at(12)), (at(13), at(14)), (at(16), at(17))]
+    assert intersect_intervals(first, []) == []
+
+
+def test_subtract_intervals():
+    windows = [(at(9), at(17))]
+    busy = [(at(8), at(9, 30)), (at(12), at(13)), (at(16, 30), at(18))]
+    assert subtract_intervals(windows, busy) == [(at(9, 30), at(12)), (at(13), at(16, 30))]
+    assert subtract_intervals(windows, [(at(8), at(18))]) == []
+
+
+def test_working_windows_skip_weekends_and_use_attendee_timezone():
+    start = datetime(2025, 1, 3, tzinfo=timezone.utc)  # Friday
+    end = datetime(2025, 1, 7, tzinfo=timezone.utc)
+    windows = working_windows(start, end, {"timezone": "America/New_York"})
+    assert [(s.isoformat(), e.isoformat()) for s, e in windows] == [
+        ("2025-01-03T09:00:00-05:00", "2025-01-03T17:00:00-05:00"),
+        ("2025-01-06T09:00:00-05:00", "2025-01-06T17:00:00-05:00"),
+    ]
+
+
+def test_find_candidate_slots_prefers_buffer_within_a_day():
+    windows = [(at(9), at(17))]
+    busy = [(at(10), at(11)), (at(12), at(15))]
+    slots = find_candidate_slots(busy, windows, timedelta(minutes=30), max_candidates=3)
+    assert [(s["start"], s["buffer_minutes"]) for s in slots] == [
+        (at(15, 30), 30),
+        (at(16), 30),
+        (at(9), 0),
+    ]
+
+
+def test_find_candidate_slots_ranks_earlier_days_first():
+    windows = [(at(9), at(10)), (at(9, day=7), at(17, day=7))]
+    slots = find_candidate_slots([], windows, timedelta(hours=1))
+    assert slots[0]["start"] == at(9)
+    assert all(s["end"] - s["start"] == timedelta(hours=1) for s in slots)
+
+
+def test_find_candidate_slots_aligns_to_step_and_skips_short_gaps():
+    windows = [(at(9), at(12))]
+    busy = [(at(9, 10), at(10, 50)), (at(11, 20), at(12))]
+    slots = find_candidate_slots(busy, windows, timedelta(minutes=30))
+    assert [s["start"] for s in slots] == []
+    slots = find_candidate_slots(busy[:1], windows, timedelta(minutes=30))
+    assert [(s["start"], s["buffer_minutes"]) for s in slots] == [(at(11), 10), (at(11, 30), 0)]
@@ -0,0 +1,294 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from app import server
+from app.server import AdmissionController, Overloaded
+from app.session_store import FileSessionStore
+
+
+def test_admission_rejects_user_over_pending_limit():
+    async def scenario():
+        admission = AdmissionController(max_concurrency=1, max_queue=10, per_user_max_pending=1)
+        async with admission.admit("alice"):
+            with pytest.raises(Overloaded) as excinfo:
+                async with admission.admit("alice"):
+                    pass
+            assert excinfo.value.status == 429
+            assert admission._pending == {"alice": 1}
+        assert admission._pending == {}
+
+    asyncio.run(scenario())
+
+
+def test_admission_rejects_when_queue_is_full():
+    async def scenario():
+        admission = AdmissionController(max_concurrency=1, max_queue=1, per_user_max_pending=5)
+        release = asyncio.Event()
+        entered = asyncio.Event()
+
+        async def hold(user_id):
+            async with admission.admit(user_id):
+                entered.set()
+                await release.wait()
+
+        running = asyncio.create_task(hold("alice"))
+        await entered.wait()
+        queued = asyncio.create_task(hold("bob"))
+        await asyncio.sleep(0)
+        assert admission.waiting == 1
+
+        with pytest.raises(Overloaded) as excinfo:
+            async with admission.admit("carol"):
+                pass
+        assert excinfo.value.status == 503
+
+        release.set()
+        await asyncio.gather(running, queued)
+        assert admission.waiting == 0
+        assert admission._pending == {}
+        assert admission._user_slots == {}
+
+    asyncio.run(scenario())
+
+
+def test_admission_releases_slot_when_cancelled_while_queued():
+    async def scenario():
+        admission = AdmissionController(max_concurrency=1, max_queue=5)
+        release = asyncio.Event()
+
+        async def hold(user_id):
+            async with admission.admit(user_id):
+                await release.wait()
+
+        running = asyncio.create_task(hold("alice"))
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(hold("bob"))
+        await asyncio.sleep(0)
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        assert admission.waiting == 0
+        assert "bob" not in admission._pending
+
+        release.set()
+        await running
+        assert admission._pending == {}
+
+    asyncio.run(scenario())
+
+
+def test_per_user_limit_holds_across_workers(tmp_path):
+    async def scenario():
+        # Two controllers sharing one store stand in for two server workers
+        store = FileSessionStore(str(tmp_path))
+        workers = [AdmissionController(store=store, turn_wait=0.5) for _ in range(2)]
+        release = asyncio.Event()
+        entered = asyncio.Event()
+
+        async def hold():
+            async with workers[0].admit("alice"):
+                entered.set()
+                await release.wait()
+
+        running = asyncio.create_task(hold())
+        await entered.wait()
+        with pytest.raises(Overloaded) as excinfo:
+            async with workers[1].admit("alice"):
+                pass
+        assert excinfo.value.status == 429
+        async with workers[1].admit("bob"):
+            pass
+
+        # A turn queued on the other worker starts once the first one ends
+        queued = asyncio.create_task(hold_second(workers[1]))
+        await asyncio.sleep(0.1)
+        assert not queued.done()
+        release.set()
+        await asyncio.gather(running, queued)
+        assert workers[0]._pending == {} and workers[1]._pending == {}
+
+    async def hold_second(worker):
+        async with worker.admit("alice"):
+            pass
+
+    asyncio.run(scenario())
+
+
+async def _post_chat(body: bytes):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": body}
+
+    async def send(message):
+        messages.append(message)
+
+    await server.app({"type": "http", "path": "/v1/chat", "method": "POST", "headers": []}, receive, send)
+    return messages[0]["status"], json.loads(messages[1]["body"])
+
+
+@pytest.mark.parametrize("body", [b"[1, 2]", b"\"hello\"", b"not json"])
+def test_chat_rejects_bodies_that_are_not_json_objects(body):
+    status, payload = asyncio.run(_post_chat(body))
+    assert status == 400
+    assert payload == {"error": "Request body must be a JSON object"}
+
+
+def test_chat_requires_user_and_message():
+    status, payload = asyncio.run(_post_chat(b'{"user_id": "alice"}'))
+    assert status == 400
+    assert "required" in payload["error"]
+
+
+class BlockingAgent:
+    """Agent whose turn emits one message, then blocks until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.finished = threading.Event()
+
+    def stream_message(self, query, history=None, turn_id=None):
+        yield {"type": "message", "content": "working on it"}
+        self.release.wait(5)
+        self.finished.set()
+        yield {"type": "message", "content": "done"}
+
+
+class MemoryStore:
+    def __init__(self):
+        self.histories = {}
+
+    def get_history(self, user_id):
+        return list(self.histories.get(user_id, []))
+
+    def append(self, user_id, messages):
+        self.histories.setdefault(user_id, []).extend(messages)
+
+
+@pytest.fixture
+def blocking_server(monkeypatch):
+    agent = BlockingAgent()
+    admission = AdmissionController(max_concurrency=1, max_queue=1)
+    store = MemoryStore()
+    monkeypatch.setattr(server, "get_agent", lambda: agent)
+    monkeypatch.setattr(server, "_get_store", lambda: store)
+    monkeypatch.setattr(server, "_admission", admission)
+    yield agent, admission, store
+    agent.release.set()
+
+
+class Client:
+    """ASGI receive/send pair for one request; disconnect() makes receive report it."""
+
+    def __init__(self, *messages, fail_sends=False):
+        self.incoming = list(messages)
+        self.gone = asyncio.Event()
+        self.fail_sends = fail_sends
+        self.sent = []
+
+    async def receive(self):
+        if self.incoming:
+            return self.incoming.pop(0)
+        await self.gone.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        if self.fail_sends and message.get("body"):
+            raise OSError("client went away")
+        self.sent.append(message)
+
+    def disconnect(self):
+        self.gone.set()
+
+    def events(self):
+        lines = b"".join(m.get("body", b"") for m in self.sent[1:]).splitlines()
+        return [json.loads(line) for line in lines]
+
+
+CHAT_SCOPE = {"type": "http", "path": "/v1/chat", "method": "POST", "headers": []}
+CHAT_BODY = {"type": "http.request", "body": b'{"user_id": "alice", "message": "hi"}'}
+
+
+def test_chat_streams_events_and_stores_history(blocking_server):
+    agent, admission, store = blocking_server
+    agent.release.set()
+    client = Client(CHAT_BODY)
+    asyncio.run(server.app(CHAT_SCOPE, client.receive, client.send))
+    assert [e.get("content", e["type"]) for e in client.events()] == ["working on it", "done", "done"]
+    assert store.histories["alice"][-1] == {"role": "assistant", "content": "done"}
+
+
+def test_failed_send_keeps_slot_until_agent_thread_finishes(blocking_server):
+    agent, admission, store = blocking_server
+
+    async def scenario():
+        client = Client(CHAT_BODY, fail_sends=True)
+        handler = asyncio.create_task(server.app(CHAT_SCOPE, client.receive, client.send))
+        await asyncio.sleep(0.2)
+        assert not handler.done()
+        assert admission._slots.locked()
+
+        agent.release.set()
+        with pytest.raises(OSError):
+            await handler
+        assert agent.finished.is_set()
+        assert not admission._slots.locked()
+        assert admission._pending == {}
+
+    asyncio.run(scenario())
+
+
+def test_http_disconnect_stops_the_turn(blocking_server):
+    agent, admission, store = blocking_server
+
+    async def scenario():
+        client = Client(CHAT_BODY)
+        handler = asyncio.create_task(server.app(CHAT_SCOPE, client.receive, client.send))
+        await asyncio.sleep(0.2)
+        assert [e["content"] for e in client.events()] == ["working on it"]
+
+        client.disconnect()
+        await asyncio.sleep(0.1)
+        # The agent thread is still running, so the slot is still taken
+        assert not handler.done()
+        assert admission._slots.locked()
+
+        agent.release.set()
+        await handler
+        assert [e["content"] for e in client.events()] == ["working on it"]
+        assert not admission._slots.locked()
+        assert "alice" not in store.histories
+
+    asyncio.run(scenario())
+
+
+def test_websocket_disconnect_stops_the_turn(blocking_server):
+    agent, admission, store = blocking_server
+
+    async def scenario():
+        client = Client(
+            {"type": "websocket.connect"},
+            {"type": "websocket.receive", "text": '{"message": "hi"}'},
+        )
+
+        async def receive():
+            message = await client.receive()
+            return {"type": "websocket.disconnect"} if message["type"] == "http.disconnect" else message
+
+        scope = {"type": "websocket", "path": "/v1/ws", "query_string": b"user_id=alice"}
+        handler = asyncio.create_task(server.app(scope, receive, client.send))
+        await asyncio.sleep(0.2)
+        client.disconnect()
+        await asyncio.sleep(0.1)
+        agent.release.set()
+        await asyncio.wait_for(handler, 5)
+        texts = [json.loads(m["text"]) for m in client.sent if m["type"] == "websocket.send"]
+        assert [t.get("content") for t in texts] == ["working on it"]
+        assert not admission._slots.locked()
+
+    asyncio.run(scenario())
+
+
@@ -0,0 +1,29 @@
+from app.session_store import MAX_HISTORY_MESSAGES, FileSessionStore
+
+
+def test_file_store_appends_and_trims_history(tmp_path):
+    store = FileSessionStore(str(tmp_path))
+    assert store.get_history("alice") == []
+    for i in range(MAX_HISTORY_MESSAGES):
+        store.append("alice", [{"role": "user", "content": str(i)}, {"role": "assistant", "content": "ok"}])
+    history = store.get_history("alice")
+    assert len(history) == MAX_HISTORY_MESSAGES
+    assert history[-1] == {"role": "assistant", "content": "ok"}
+    store.clear("alice")
+    assert store.get_history("alice") == []
+
+
+def test_file_store_turn_slots_are_shared_between_workers(tmp_path):
+    # Two store instances stand in for two worker processes on one host
+    first, second = FileSessionStore(str(tmp_path)), FileSessionStore(str(tmp_path))
+    token = first.acquire_turn("alice", 1)
+    assert token is not None
+    assert second.acquire_turn("alice", 1) is None
+    assert second.acquire_turn("bob", 1) is not None
+
+    other = second.acquire_turn("alice", 2)
+    assert other is not None
+    second.release_turn("alice", other)
+
+    first.release_turn("alice", token)
+    assert second.acquire_turn("alice", 1) is not None
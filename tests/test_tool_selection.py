@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.tool_selection import TOOL_INTENTS, select_tools
+
+TOOLS = [SimpleNamespace(name=name) for name in ["search_calendar_events", *TOOL_INTENTS]]
+
+
+def selected(query, history=None):
+    return {t.name for t in select_tools(query, TOOLS, history)}
+
+
+@pytest.mark.parametrize("query", [
+    "Add a Zoom link to every meeting with Alice",
+    "Cancel all my 1:1s next week",
+    "Set the color of each standup to red",
+    "Append the agenda to all project syncs",
+])
+def test_bulk_requests_expose_bulk_tool(query):
+    assert "bulk_calendar_operation" in selected(query)
+
+
+@pytest.mark.parametrize("query", [
+    "Find an hour next week when Alice, Bob and I are all free",
+    "Is my afternoon clear?",
+    "Am I busy on Friday?",
+])
+def test_availability_questions_expose_meeting_times_only(query):
+    names = selected(query)
+    assert "find_meeting_times" in names
+    assert not names & {"bulk_calendar_operation", "delete_calendar_event", "create_calendar_event"}
+
+
+def test_place_names_do_not_trigger_create():
+    assert selected("Move my New York meeting to Friday") == {"update_calendar_event", "search_calendar_events"}
+    assert "create_calendar_event" in selected("Put a new meeting on Monday")
+
+
+def test_clearing_a_block_exposes_delete():
+    assert "delete_calendar_event" in selected("Clear my afternoon")
+
+
+def test_follow_up_keeps_previous_turn_tools():
+    history = [
+        {"role": "user", "content": "Delete all my 1:1s next week"},
+        {"role": "assistant", "content": "A dry run found 6 events. Delete them?"},
+    ]
+    names = selected("Yes, go ahead", history)
+    assert {"bulk_calendar_operation", "delete_calendar_event", "search_calendar_events"} <= names
+    assert "analyze_calendar" not in names
+
+
+def test_unmatched_query_falls_back_to_all_tools():
+    assert selected("Yes") == {t.name for t in TOOLS}
+    assert selected("Move it to 3pm") == {"update_calendar_event", "search_calendar_events"}